@@ -0,0 +1,69 @@
+"""Benchmark JSON decoding of InPost ``v4/parcels/tracked`` bodies.
+
+``request_json`` used to call ``resp.text()`` and parse the resulting str
+with the stdlib. It now hands the raw bytes to a pluggable decoder, which
+is orjson when installed. The script compares the old text path with
+stdlib and orjson decoding straight from bytes.
+
+Run from the repository root:
+
+    python benchmarks/bench_json_decoders.py
+"""
+from __future__ import annotations
+
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.payloads import inpost_tracked_body  # noqa: E402
+from custom_components.polish_shipment_tracking.api_helpers import (  # noqa: E402
+    _stdlib_loads,
+    orjson,
+)
+
+SIZES = [10, 50, 200, 1000]
+
+
+def _text_then_stdlib(body: bytes):
+    """Previous behaviour: decode to str first, then parse."""
+    return json.loads(body.decode("utf-8"))
+
+
+def _decoders():
+    decoders = [("text+json", _text_then_stdlib), ("bytes json", _stdlib_loads)]
+    if orjson is not None:
+        decoders.append(("bytes orjson", orjson.loads))
+    return decoders
+
+
+def _best(func, body: bytes, repeat: int = 7, number: int = 20) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(body)
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def main() -> None:
+    decoders = _decoders()
+    header = f"{'parcels':>8} {'KiB':>8}" + "".join(f" {name + ' ms':>16}" for name, _ in decoders)
+    print(header)
+    for size in SIZES:
+        body = inpost_tracked_body(size)
+        expected = _text_then_stdlib(body)
+        row = f"{size:>8} {len(body) / 1024:>8.1f}"
+        for _name, func in decoders:
+            assert func(body) == expected
+            row += f" {_best(func, body) * 1e3:>16.3f}"
+        print(row)
+    if orjson is None:
+        print("orjson is not installed; only stdlib decoders were timed")
+
+
+if __name__ == "__main__":
+    main()
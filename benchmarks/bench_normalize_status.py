@@ -0,0 +1,190 @@
+"""Micro-benchmark for helpers.normalize_status.
+
+Checks that the compiled, memoized matcher returns exactly what the original
+chain of substring checks returned, then times both implementations.
+
+Run from the repository root:
+
+    python benchmarks/bench_normalize_status.py
+"""
+from __future__ import annotations
+
+import itertools
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.polish_shipment_tracking.helpers import (  # noqa: E402
+    _STATUS_MAP,
+    _normalize_status_text,
+    normalize_status,
+)
+
+COURIERS = ["inpost", "dpd", "dhl", "pocztex", None]
+
+FALLBACK_SAMPLES = [
+    "Ready",
+    "ready ",
+    "Delivered to locker",
+    "Delivered to pickup point",
+    "Parcel picked up by the receiver",
+    "Collected by customer",
+    "Ready for collection",
+    "Ready to pick up",
+    "Pickup at point",
+    "Delivered",
+    "Przesyłka awizowana",
+    "Przesyłka odebrana",
+    "Wydano adresatowi",
+    "Doręczono",
+    "Dostarczona",
+    "Zwrot do nadawcy",
+    "Odesłana",
+    "Anulowana",
+    "Rezygnacja odbiorcy",
+    "Problem z doręczeniem",
+    "Niedoręczona",
+    "Odmowa przyjęcia",
+    "Out for delivery",
+    "Handed over for delivery",
+    "Returned",
+    "Cancelled by sender",
+    "Delivery failed",
+    "Delay in delivery",
+    "Undeliverable",
+    "In transit",
+    "Departed facility",
+    "Arrived at hub",
+    "Received in depot",
+    "Label created",
+    "Pre-transit",
+    "Info received",
+    "Ready to send",
+    "Something else entirely",
+    "Zażółć gęślą jaźń",
+    "delivęred",
+    "ŁÓDŹ - w transporcie",
+    "",
+    "   ",
+    None,
+]
+
+
+def _legacy_normalize_status(raw_status, courier):
+    """Reference copy of the pre-compiled implementation."""
+    status_text = str(raw_status or "").strip()
+    if not status_text:
+        return "unknown"
+
+    status_upper = status_text.upper()
+    courier_map = _STATUS_MAP.get(courier, {})
+    if status_upper in courier_map:
+        return courier_map[status_upper]
+
+    status_lower = status_text.lower()
+    status_ascii = status_lower.translate(str.maketrans("ąćęłńóśżź", "acelnoszz"))
+
+    if status_lower in {"ready"}:
+        return "waiting_for_pickup"
+    if any(x in status_lower for x in ["delivered to locker", "delivered to point", "delivered to parcel locker", "delivered to pickup point"]):
+        return "waiting_for_pickup"
+    if any(x in status_lower for x in ["picked up", "collected by", "collected"]):
+        return "delivered"
+    if any(x in status_lower for x in ["ready for collection", "ready to pick", "ready for pick"]):
+        return "waiting_for_pickup"
+    if any(x in status_lower for x in ["pickup", "collection", "locker"]):
+        return "waiting_for_pickup"
+    if "delivered" in status_lower:
+        return "delivered"
+    if "awizo" in status_ascii:
+        return "waiting_for_pickup"
+    if any(x in status_ascii for x in ["odebr", "wydan", "odebrane"]):
+        return "delivered"
+    if any(x in status_ascii for x in ["dorecz", "dostarcz"]):
+        return "delivered"
+    if any(x in status_ascii for x in ["zwrot", "odesl"]):
+        return "returned"
+    if any(x in status_ascii for x in ["anul", "rezygn"]):
+        return "cancelled"
+    if any(x in status_ascii for x in ["problem", "niedorecz", "odmow"]):
+        return "exception"
+    if any(x in status_lower for x in ["out for delivery", "handed over for delivery"]):
+        return "handed_out_for_delivery"
+    if any(x in status_lower for x in ["return", "returned"]):
+        return "returned"
+    if any(x in status_lower for x in ["cancel", "canceled", "cancelled"]):
+        return "cancelled"
+    if any(x in status_lower for x in ["fail", "failed", "delay", "exception", "undeliver", "missing", "rejected"]):
+        return "exception"
+    if any(x in status_lower for x in ["transit", "in transport", "departed", "arrived", "processed", "received", "adopted"]):
+        return "in_transport"
+    if any(x in status_lower for x in ["created", "pre-transit", "label", "confirmed", "info received", "ready to send"]):
+        return "created"
+
+    return "unknown"
+
+
+def build_corpus() -> list[tuple[object, str | None]]:
+    """Return (raw_status, courier) pairs covering map hits and every fallback."""
+    statuses: list[object] = list(FALLBACK_SAMPLES)
+    for courier_map in _STATUS_MAP.values():
+        for key in courier_map:
+            statuses.extend([key, key.lower(), key.title(), f" {key} "])
+    # Combinations exercise the priority order between fallback rules.
+    texts = [s for s in FALLBACK_SAMPLES if isinstance(s, str) and s.strip()]
+    statuses.extend(f"{a} / {b}" for a, b in itertools.permutations(texts, 2))
+    return [(status, courier) for status in statuses for courier in COURIERS]
+
+
+def verify(corpus) -> int:
+    """Assert both implementations agree; return the number of cases checked."""
+    mismatches = [
+        (raw, courier, _legacy_normalize_status(raw, courier), normalize_status(raw, courier))
+        for raw, courier in corpus
+        if _legacy_normalize_status(raw, courier) != normalize_status(raw, courier)
+    ]
+    if mismatches:
+        for raw, courier, expected, actual in mismatches[:20]:
+            print(f"MISMATCH {courier!r} {raw!r}: expected {expected}, got {actual}")
+        raise SystemExit(f"{len(mismatches)} mismatches")
+    return len(corpus)
+
+
+def _run(func, corpus) -> None:
+    for raw, courier in corpus:
+        func(raw, courier)
+
+
+def main() -> None:
+    corpus = build_corpus()
+    checked = verify(corpus)
+    print(f"verified {checked} (status, courier) pairs")
+
+    repeat = 5
+
+    def _cold() -> None:
+        _normalize_status_text.cache_clear()
+        _run(normalize_status, corpus)
+
+    legacy = min(timeit.repeat(lambda: _run(_legacy_normalize_status, corpus), number=1, repeat=repeat))
+    cold = min(timeit.repeat(_cold, number=1, repeat=repeat))
+    per_call = 1e6 / len(corpus)
+    print(f"full corpus ({len(corpus)} pairs, every call a cache miss)")
+    print(f"  legacy           {legacy * per_call:8.3f} us/call")
+    print(f"  compiled         {cold * per_call:8.3f} us/call")
+
+    # A refresh sees the same handful of statuses over and over.
+    working_set = [(raw, courier) for raw in FALLBACK_SAMPLES for courier in COURIERS] * 50
+    _run(normalize_status, working_set)
+    legacy = min(timeit.repeat(lambda: _run(_legacy_normalize_status, working_set), number=1, repeat=repeat))
+    warm = min(timeit.repeat(lambda: _run(normalize_status, working_set), number=1, repeat=repeat))
+    per_call = 1e6 / len(working_set)
+    print(f"refresh working set ({len(working_set)} calls, warm cache)")
+    print(f"  legacy           {legacy * per_call:8.3f} us/call")
+    print(f"  compiled + LRU   {warm * per_call:8.3f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,513 @@
+"""Benchmark the refresh-to-entity pipeline for every courier.
+
+For 10, 1k and 10k parcels per courier, times each stage of one refresh on
+an in-memory account (no network, stubbed hass):
+
+    fetch_parcels        ShipmentCoordinator._fetch_parcels on canned API answers
+    get_parcel_id        helpers.get_parcel_id over the list entries
+    get_raw_status       helpers.get_raw_status over the list entries
+    normalize_status     helpers.normalize_status over the raw statuses
+    build_parcels        models.build_parcels
+    set_parcels          ShipmentCoordinator._set_parcels (index, counts, change sets)
+    setup_entities       sensor async_update_parcels creating every sensor
+    update_parcels       async_update_parcels after a refresh with churn
+    sensor_fanout        ShipmentSensor._handle_coordinator_update for every sensor
+    state_attributes     extra_state_attributes of every sensor, JSON encoded
+    active_shipments     ActiveShipmentsSensor update and native_value
+
+Refreshes after the first change ``--churn`` of the parcels' statuses, drop
+as many and add as many new ones. Each of them also checks that every status
+change, delivered ones included, fired a status changed event.
+
+Run from the repository root (requires Home Assistant to be installed):
+
+    python benchmarks/bench_pipeline.py [--sizes 10,1000,10000] [--rounds 10] [--output run.json]
+    python benchmarks/bench_pipeline.py --compare base.json run.json [--threshold 0.05]
+
+Each round runs in its own worker process; every stage reports its best and
+median run over all rounds and the best run of each round.
+
+``--compare`` prints the ratio of the median round bests of every courier,
+size and stage, then their geometric mean per stage, and exits with 1 when
+a stage got slower than the threshold allows. Ratios are taken relative to
+the median ratio of all rows, which tracks how fast the machine was for
+each run; a change that slows most stages alike goes unnoticed. The
+threshold is widened by the standard error of the mean, estimated from how
+far the round bests scatter. Rows under 0.5 ms are left out of it.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+import gc
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.payloads import GENERATORS, churned, courier_items, pocztex_details  # noqa: E402
+from homeassistant.helpers.json import json_dumps  # noqa: E402
+from custom_components.polish_shipment_tracking import sensor as sensor_platform  # noqa: E402
+from custom_components.polish_shipment_tracking.api_helpers import DetailCache  # noqa: E402
+from custom_components.polish_shipment_tracking.const import DOMAIN  # noqa: E402
+from custom_components.polish_shipment_tracking.coordinator import (  # noqa: E402
+    AccountView,
+    ShipmentCoordinator,
+)
+from custom_components.polish_shipment_tracking.helpers import (  # noqa: E402
+    get_parcel_id,
+    get_raw_status,
+    normalize_status,
+)
+from custom_components.polish_shipment_tracking.models import build_parcels  # noqa: E402
+
+SIZES = [10, 1000, 10000]
+COURIERS = list(GENERATORS)
+# Rows faster than this are noise and left out of the --compare verdict.
+MIN_COMPARE_SECONDS = 500e-6
+# --compare widens the threshold by this many standard errors of a stage's
+# mean ratio. A single row is too noisy to judge on a busy machine, where
+# whole rounds of a stage can run 1.5x slower.
+NOISE_FACTOR = 3.0
+# Fewest runs per stage and round, taken at the largest sizes.
+MIN_REPEAT = 3
+
+
+class StubHass:
+    """Just enough of HomeAssistant for the sensor platform."""
+
+    def __init__(self) -> None:
+        self.data: dict = {DOMAIN: {}}
+        self.is_running = True
+        self.config = SimpleNamespace(language="en")
+        self.fired: Counter[str] = Counter()
+        self.bus = SimpleNamespace(
+            async_fire=lambda event_type, data=None: self.fired.update([event_type]),
+            async_listen_once=lambda event_type, listener: None,
+        )
+
+
+class StubRegistry:
+    """Entity registry holding the sensors the platform added."""
+
+    def __init__(self) -> None:
+        self.entries: dict[str, SimpleNamespace] = {}
+
+    def add(self, entry_id: str, entity) -> None:
+        unique_id = entity.unique_id
+        entity.entity_id = f"sensor.{unique_id}"
+        self.entries[unique_id] = SimpleNamespace(
+            unique_id=unique_id,
+            entity_id=entity.entity_id,
+            config_entry_id=entry_id,
+            platform=DOMAIN,
+        )
+
+    def for_config_entry(self, entry_id: str) -> list[SimpleNamespace]:
+        return [e for e in self.entries.values() if e.config_entry_id == entry_id]
+
+    def async_remove(self, entity_id: str) -> None:
+        unique_id = entity_id.removeprefix("sensor.")
+        self.entries.pop(unique_id, None)
+
+    def async_get_entity_id(self, domain: str, platform: str, unique_id: str) -> str | None:
+        entry = self.entries.get(unique_id)
+        return entry.entity_id if entry else None
+
+
+class StubApi:
+    """Courier client answering from canned payloads."""
+
+    def __init__(self, courier: str) -> None:
+        self.courier = courier
+        self.items: list[dict] = []
+        self.detail_cache = DetailCache()
+        self.list_unchanged = False
+
+    async def get_parcels(self):
+        if self.courier == "inpost":
+            return {"parcels": self.items, "more": False}
+        if self.courier == "dpd":
+            return {"packages": self.items}
+        return self.items
+
+    async def iter_parcels(self):
+        for item in self.items:
+            yield item
+
+    async def get_parcel_details(self, tracking_id):
+        return self._details[tracking_id]
+
+    def set_items(self, items: list[dict]) -> None:
+        self.items = items
+        if self.courier == "pocztex":
+            self._details = {item["trackingId"]: pocztex_details(item) for item in items}
+
+
+class BenchCoordinator:
+    """The parts of ShipmentCoordinator a refresh runs, without the HA plumbing."""
+
+    _fetch_parcels = ShipmentCoordinator._fetch_parcels
+    _set_parcels = ShipmentCoordinator._set_parcels
+    _parcel_list_unchanged = ShipmentCoordinator._parcel_list_unchanged
+    active_ids = ShipmentCoordinator.active_ids
+
+    def __init__(self, hass: StubHass, courier: str) -> None:
+        self.hass = hass
+        self.courier = courier
+        self.entry = SimpleNamespace(
+            entry_id=f"bench_{courier}",
+            data={"courier": courier, "phone": "600700800"},
+            options={},
+            async_on_unload=lambda func: None,
+        )
+        self.entries = [self.entry]
+        self.api = StubApi(courier)
+        self.data = None
+        self.known_parcels: set[str] = set()
+        self.parcels_by_id: dict = {}
+        self.previous_parcels_by_id: dict = {}
+        self.active_counts: Counter[str] = Counter()
+        self.added_ids: set[str] = set()
+        self.removed_ids: set[str] = set()
+        self.changed_ids: set[str] = set()
+        self._active_fingerprints: dict[str, str] = {}
+        self.timeline = SimpleNamespace(record=lambda parcels: None)
+        self.raw_response_on_demand = False
+        self.last_update_success = True
+        self.poll_interval = self.update_interval = None
+        self._listeners: list = []
+
+    def async_add_listener(self, update_callback):
+        self._listeners.append(update_callback)
+        return lambda: self._listeners.remove(update_callback)
+
+
+def _time(func, repeat: int) -> list[float]:
+    # As timeit does, keep the cyclic GC from running inside a sample.
+    samples = []
+    gc.collect()
+    for _ in range(repeat):
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+        finally:
+            gc.enable()
+    return samples
+
+
+def _new_account(courier: str) -> tuple[StubHass, StubRegistry, BenchCoordinator]:
+    """Return a fresh hass, entity registry and coordinator for one account."""
+    hass = StubHass()
+    registry = StubRegistry()
+    sensor_platform.async_get_entity_registry = lambda _hass: registry
+    sensor_platform.async_entries_for_config_entry = (
+        lambda _registry, entry_id: registry.for_config_entry(entry_id)
+    )
+    coordinator = BenchCoordinator(hass, courier)
+    hass.data[DOMAIN][coordinator.entry.entry_id] = AccountView(coordinator, coordinator.entry)
+    return hass, registry, coordinator
+
+
+def bench_courier(courier: str, size: int, repeat: int, churn: float) -> dict[str, list[float]]:
+    """Time every stage for one courier and size; return the samples per stage."""
+    loop = asyncio.new_event_loop()
+    hass, registry, coordinator = _new_account(courier)
+
+    first = courier_items(courier, size)
+    refreshes = [churned(courier, first, churn, seed) for seed in range(1, repeat + 1)]
+    samples: dict[str, list[float]] = {}
+
+    def record(stage: str, func, times: int = repeat) -> None:
+        samples.setdefault(stage, []).extend(_time(func, times))
+
+    # Parsing stages run on the first payload; they do not mutate state.
+    coordinator.api.set_items(first)
+
+    def fetch() -> list:
+        # Cached Pocztex details would turn later runs into cache hits.
+        coordinator.api.detail_cache = DetailCache()
+        return loop.run_until_complete(coordinator._fetch_parcels())
+
+    record("fetch_parcels", fetch)
+    items = fetch()
+    record("get_parcel_id", lambda: [get_parcel_id(item, courier) for item in items])
+    statuses = [get_raw_status(item, courier) for item in items]
+    record("get_raw_status", lambda: [get_raw_status(item, courier) for item in items])
+    record("normalize_status", lambda: [normalize_status(status, courier) for status in statuses])
+    record("build_parcels", lambda: build_parcels(items, courier))
+
+    # First refresh: every parcel is new and gets a sensor. Each run starts
+    # from an empty account; the last one goes on to the refreshes.
+    def add_entities(new_entities) -> None:
+        for entity in new_entities:
+            entity.async_write_ha_state = lambda: None
+            registry.add(coordinator.entry.entry_id, entity)
+        entities.extend(new_entities)
+
+    for _ in range(repeat):
+        hass, registry, coordinator = _new_account(courier)
+        coordinator.api.set_items(first)
+        entities: list = []
+        coordinator.data = coordinator._set_parcels(build_parcels(items, courier))
+        record(
+            "setup_entities",
+            lambda: loop.run_until_complete(
+                sensor_platform.async_setup_entry(hass, coordinator.entry, add_entities)
+            ),
+            1,
+        )
+    update_parcels = coordinator._listeners[-1]
+    global_sensor = hass.data[DOMAIN]["_active_shipments_sensor"]
+    global_listener = coordinator._listeners[0]
+
+    # Following refreshes, each with its own churn.
+    for refreshed in refreshes:
+        coordinator.api.set_items(refreshed)
+        new_parcels = build_parcels(fetch(), courier)
+        # HA removes entities after the listeners ran, so sensors of parcels
+        # that went away still get this update.
+        # A parcel dropped and added again has a new sensor; keep the latest.
+        shipment_sensors = list(
+            {
+                e.unique_id: e
+                for e in entities
+                if isinstance(e, sensor_platform.ShipmentSensor) and e.unique_id in registry.entries
+            }.values()
+        )
+        record("set_parcels", lambda: coordinator._set_parcels(new_parcels), 1)
+        coordinator.data = new_parcels
+        record("update_parcels", update_parcels, 1)
+        fired = hass.fired[sensor_platform.EVENT_STATUS_CHANGED]
+        record(
+            "sensor_fanout",
+            lambda: [s._handle_coordinator_update() for s in shipment_sensors],
+            1,
+        )
+        # Every status change of a parcel with a sensor, delivered included.
+        previous = coordinator.previous_parcels_by_id
+        transitions = sum(
+            1
+            for s in shipment_sensors
+            if s._tracking_number in coordinator.parcels_by_id
+            and previous[s._tracking_number].status_key
+            != coordinator.parcels_by_id[s._tracking_number].status_key
+        )
+        if hass.fired[sensor_platform.EVENT_STATUS_CHANGED] - fired != transitions:
+            raise RuntimeError(f"{courier}: a status transition fired no event")
+        record(
+            "active_shipments",
+            lambda: (global_listener(), global_sensor.native_value),
+            1,
+        )
+
+    active = [
+        e
+        for e in entities
+        if isinstance(e, sensor_platform.ShipmentSensor)
+        and e._tracking_number in coordinator.parcels_by_id
+    ]
+    record(
+        "state_attributes",
+        lambda: [json_dumps(s.extra_state_attributes) for s in active],
+    )
+    loop.close()
+    return samples
+
+
+def run_round(args: argparse.Namespace) -> dict:
+    """Time every courier and size once in this process."""
+    samples: dict[str, list[float]] = {}
+    for size in args.sizes:
+        repeat = max(MIN_REPEAT, min(args.repeat, args.repeat * 1000 // max(size, 1000)))
+        for courier in args.couriers:
+            for stage, values in bench_courier(courier, size, repeat, args.churn).items():
+                samples[f"{size}:{courier}:{stage}"] = values
+    return {"samples": samples}
+
+
+def run(args: argparse.Namespace) -> dict:
+    # Every round runs in a fresh process, as pyperf does: string hashing
+    # and memory layout differ per process and can make some stages up to
+    # 1.5x slower for a whole run, which more samples in one process never undo.
+    # Samples of each round, kept apart to tell how much the rounds differ.
+    samples: dict[tuple[int, str, str], list[list[float]]] = {}
+    for _ in range(args.rounds):
+        worker = subprocess.run(
+            [
+                sys.executable,
+                __file__,
+                "--worker",
+                "--sizes", ",".join(map(str, args.sizes)),
+                "--couriers", ",".join(args.couriers),
+                "--repeat", str(args.repeat),
+                "--churn", str(args.churn),
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        round_result = json.loads(worker.stdout)
+        for name, values in round_result["samples"].items():
+            size, courier, stage = name.split(":")
+            samples.setdefault((int(size), courier, stage), []).append(values)
+
+    results = []
+    print(f"{'courier':>8} {'parcels':>7} {'stage':>17} {'best ms':>10} {'median ms':>10} {'us/parcel':>10}")
+    for (size, courier, stage), rounds in samples.items():
+        values = [value for round_values in rounds for value in round_values]
+        best = min(values)
+        row = {
+            "courier": courier,
+            "parcels": size,
+            "stage": stage,
+            "best_s": best,
+            "median_s": statistics.median(values),
+            "round_best_s": [min(round_values) for round_values in rounds],
+            "runs": len(values),
+            "per_parcel_us": best * 1e6 / size,
+        }
+        results.append(row)
+        print(
+            f"{courier:>8} {size:>7} {stage:>17} {best * 1e3:>10.3f}"
+            f" {row['median_s'] * 1e3:>10.3f} {row['per_parcel_us']:>10.2f}"
+        )
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": args.sizes,
+            "couriers": args.couriers,
+            "churn": args.churn,
+            "rounds": args.rounds,
+        },
+        "results": results,
+    }
+
+
+def _center(row: dict) -> float:
+    """Median of a stage's round bests."""
+    return statistics.median(row["round_best_s"])
+
+
+def _uncertainty(row: dict) -> float:
+    """Relative standard error of :func:`_center`.
+
+    Estimated from the median absolute deviation of the round bests, scaled
+    to a standard deviation and then to the standard error of a median.
+    """
+    rounds = row["round_best_s"]
+    center = statistics.median(rounds)
+    if len(rounds) < 2 or not center:
+        return 0.0
+    mad = statistics.median(abs(value - center) for value in rounds)
+    return 1.4826 * mad * 1.2533 / len(rounds) ** 0.5 / center
+
+
+def compare(base_path: str, new_path: str, threshold: float) -> int:
+    """Print new/base ratios per row and stage and return 1 on any regression.
+
+    A stage regresses when the geometric mean of its row ratios, relative to
+    the median row, got slower by more than ``threshold`` plus
+    ``NOISE_FACTOR`` standard errors.
+    """
+    base = json.loads(Path(base_path).read_text())
+    new = json.loads(Path(new_path).read_text())
+    for report, path in ((base, base_path), (new, new_path)):
+        if any("round_best_s" not in row for row in report["results"]):
+            raise SystemExit(f"{path} has no per-round results; run the benchmark again")
+    key = lambda row: (row["courier"], row["parcels"], row["stage"])  # noqa: E731
+    base_rows = {key(row): row for row in base["results"]}
+    # (stage, log ratio, squared relative standard error) of every row
+    # slow enough to judge.
+    judged = []
+    print(f"{'courier':>8} {'parcels':>7} {'stage':>17} {'base ms':>10} {'new ms':>10} {'ratio':>7}")
+    for row in new["results"]:
+        old = base_rows.get(key(row))
+        if old is None:
+            continue
+        base_s, new_s = _center(old), _center(row)
+        print(
+            f"{row['courier']:>8} {row['parcels']:>7} {row['stage']:>17}"
+            f" {base_s * 1e3:>10.3f} {new_s * 1e3:>10.3f} {new_s / base_s:>7.2f}"
+        )
+        if max(base_s, new_s) >= MIN_COMPARE_SECONDS:
+            judged.append(
+                (
+                    row["stage"],
+                    math.log(new_s / base_s),
+                    _uncertainty(old) ** 2 + _uncertainty(row) ** 2,
+                )
+            )
+    if not judged:
+        print("No stage is slow enough to compare")
+        return 0
+
+    # Both runs time every stage; a machine that was busier or faster for
+    # one of them moves most rows by the same factor.
+    speed = statistics.median(log_ratio for _, log_ratio, _ in judged)
+    print(f"\nMachine speed factor {math.exp(speed):.2f}; stage ratios are relative to it")
+    stages: dict[str, tuple[list[float], list[float]]] = {}
+    for stage, log_ratio, variance in judged:
+        logs, variances = stages.setdefault(stage, ([], []))
+        logs.append(log_ratio - speed)
+        variances.append(variance)
+
+    regressions = 0
+    print(f"{'stage':>17} {'rows':>5} {'ratio':>7} {'limit':>7}")
+    for stage, (logs, variances) in stages.items():
+        ratio = math.exp(statistics.fmean(logs))
+        allowed = threshold + NOISE_FACTOR * math.sqrt(sum(variances)) / len(variances)
+        flag = ""
+        if ratio > 1 + allowed:
+            flag = "  REGRESSION"
+            regressions += 1
+        elif ratio < 1 / (1 + allowed):
+            flag = "  faster"
+        print(f"{stage:>17} {len(logs):>5} {ratio:>7.2f} {1 + allowed:>7.2f}{flag}")
+    print(f"{regressions} stage regression(s) over {threshold:.0%} plus measured noise")
+    return 1 if regressions else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes", type=lambda v: [int(s) for s in v.split(",")], default=SIZES
+    )
+    parser.add_argument(
+        "--couriers", type=lambda v: v.split(","), default=COURIERS
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage and round at 1k parcels or fewer")
+    parser.add_argument("--rounds", type=int, default=10, help="worker processes running the whole suite")
+    parser.add_argument("--churn", type=float, default=0.05)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    parser.add_argument("--threshold", type=float, default=0.05)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.compare:
+        return compare(*args.compare, args.threshold)
+    if args.worker:
+        print(json.dumps(run_round(args)))
+        return 0
+    report = run(args)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2) + "\n")
+        print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
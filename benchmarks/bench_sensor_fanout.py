@@ -0,0 +1,99 @@
+"""Benchmark the per-refresh ShipmentSensor update fan-out.
+
+Every sensor looks up its own parcel after a refresh. With the coordinator's
+``parcels_by_id`` index one refresh costs O(N); the previous linear scan per
+sensor cost O(N^2). The script times both for growing parcel counts and
+prints the cost per parcel, which stays flat when scaling is linear. The
+last column is a refresh where no parcel changed and every sensor skips
+its state write.
+
+Run from the repository root (requires Home Assistant to be installed):
+
+    python benchmarks/bench_sensor_fanout.py
+"""
+from __future__ import annotations
+
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.payloads import inpost_parcels  # noqa: E402
+from custom_components.polish_shipment_tracking.models import build_parcels  # noqa: E402
+from custom_components.polish_shipment_tracking.sensor import ShipmentSensor  # noqa: E402
+
+SIZES = [125, 250, 500, 1000]
+
+
+def _make_coordinator(parcels):
+    index = {}
+    for parcel in parcels:
+        index.setdefault(parcel.parcel_id, parcel)
+    return SimpleNamespace(
+        courier="inpost",
+        data=parcels,
+        parcels_by_id=index,
+        # Every parcel counts as changed, so each sensor writes its state.
+        changed_ids=set(index),
+        last_update_success=True,
+        hass=SimpleNamespace(config=SimpleNamespace(language="en")),
+        entry=SimpleNamespace(entry_id="bench", data={"phone": "600700800"}),
+    )
+
+
+def _make_sensors(coordinator):
+    sensors = []
+    for parcel in coordinator.data:
+        sensor = ShipmentSensor(coordinator, parcel)
+        sensor.async_write_ha_state = lambda: None
+        sensors.append(sensor)
+    return sensors
+
+
+def _fanout_indexed(sensors) -> None:
+    for sensor in sensors:
+        sensor._handle_coordinator_update()
+
+
+def _fanout_scan(coordinator, sensors) -> None:
+    """Previous behaviour: each sensor scans the whole parcel list."""
+    for sensor in sensors:
+        sensor.parcel = next(
+            (p for p in coordinator.data if p.parcel_id == sensor._tracking_number),
+            None,
+        )
+
+
+def _best(func, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    print(
+        f"{'parcels':>8} {'indexed ms':>11} {'us/parcel':>10} {'scan ms':>9} {'us/parcel':>10}"
+        f" {'unchanged ms':>13}"
+    )
+    for size in SIZES:
+        coordinator = _make_coordinator(build_parcels(inpost_parcels(size), "inpost"))
+        sensors = _make_sensors(coordinator)
+        indexed = _best(lambda: _fanout_indexed(sensors))
+        scan = _best(lambda: _fanout_scan(coordinator, sensors))
+        # A refresh where nothing changed: sensors skip their state writes.
+        changed, coordinator.changed_ids = coordinator.changed_ids, set()
+        unchanged = _best(lambda: _fanout_indexed(sensors))
+        coordinator.changed_ids = changed
+        print(
+            f"{size:>8} {indexed * 1e3:>11.3f} {indexed * 1e6 / size:>10.3f}"
+            f" {scan * 1e3:>9.3f} {scan * 1e6 / size:>10.3f} {unchanged * 1e3:>13.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
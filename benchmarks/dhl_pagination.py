@@ -0,0 +1,103 @@
+"""Exercise DhlApi.iter_parcels against a local paged endpoint.
+
+Starts an aiohttp server that mimics the DHL incoming shipment list,
+split into pages with ``totalPages``/``totalElements`` metadata and a
+fixed per-page latency. It then checks that every shipment comes back
+exactly once and in order, and times sequential paging against the
+concurrent prefetch.
+
+Run from the repository root (requires Home Assistant to be installed):
+
+    python benchmarks/dhl_pagination.py [--shipments 500] [--page-size 20] [--latency 0.05]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.payloads import dhl_shipments  # noqa: E402
+from custom_components.polish_shipment_tracking import api_helpers  # noqa: E402
+from custom_components.polish_shipment_tracking.api_dhl import DhlApi  # noqa: E402
+
+HOST = "127.0.0.1"
+PATH = "/api/dhl/public/user/shipment/v2.1/list/incoming/active/{page}"
+
+
+def make_app(shipments: list[dict], page_size: int, latency: float) -> web.Application:
+    total_pages = max(1, -(-len(shipments) // page_size))
+    requests = []
+
+    async def handle_page(request: web.Request) -> web.Response:
+        page = int(request.match_info["page"])
+        body = await request.json()
+        if body.get("page") != page:
+            return web.json_response({"error": "page mismatch"}, status=400)
+        requests.append(page)
+        await asyncio.sleep(latency)
+        start = (page - 1) * page_size
+        return web.json_response(
+            {
+                "shipments": shipments[start : start + page_size],
+                "totalPages": total_pages,
+                "totalElements": len(shipments),
+                "page": page,
+            }
+        )
+
+    app = web.Application()
+    app.router.add_post(PATH, handle_page)
+    app["requests"] = requests
+    return app
+
+
+async def collect(api: DhlApi) -> tuple[list[dict], float]:
+    start = time.perf_counter()
+    items = [shipment async for shipment in api.iter_parcels()]
+    return items, time.perf_counter() - start
+
+
+async def main(args: argparse.Namespace) -> int:
+    shipments = dhl_shipments(args.shipments)
+    app = make_app(shipments, args.page_size, args.latency)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, HOST, 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    # The fake server is local; do not let the per-host limiter skew timings.
+    api_helpers.HOST_LIMITS[HOST] = (64, 10_000.0, 10_000)
+
+    failures = 0
+    try:
+        async with aiohttp.ClientSession() as session:
+            for label, prefetch in (("sequential", 1), ("prefetch", DhlApi.PAGE_PREFETCH_LIMIT)):
+                api = DhlApi(session)
+                api.BASE_URL = f"http://{HOST}:{port}/api/dhl/public"
+                api.PAGE_PREFETCH_LIMIT = prefetch
+                app["requests"].clear()
+                items, elapsed = await collect(api)
+                ok = [s["shipmentNumber"] for s in items] == [s["shipmentNumber"] for s in shipments]
+                failures += not ok
+                print(
+                    f"{label:>10}: {len(items)} shipments from {len(app['requests'])} pages"
+                    f" in {elapsed * 1e3:.1f} ms {'OK' if ok else 'MISMATCH'}"
+                )
+    finally:
+        await runner.cleanup()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--shipments", type=int, default=500)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,203 @@
+"""Synthetic courier payloads shared by the benchmarks."""
+from __future__ import annotations
+
+import json
+import random
+
+INPOST_STATUSES = [
+    "CONFIRMED",
+    "DISPATCHED_BY_SENDER",
+    "COLLECTED_FROM_SENDER",
+    "ADOPTED_AT_SORTING_CENTER",
+    "SENT_FROM_SORTING_CENTER",
+    "OUT_FOR_DELIVERY",
+    "READY_TO_PICKUP",
+    "DELIVERED",
+]
+
+
+def inpost_parcel(index: int, rng: random.Random) -> dict:
+    """Return one parcel shaped like an InPost ``v4/parcels/tracked`` entry."""
+    number = f"6{index:023d}"
+    return {
+        "shipmentNumber": number,
+        "shipmentType": "parcel",
+        "status": rng.choice(INPOST_STATUSES),
+        "openCode": f"{rng.randrange(1_000_000):06d}",
+        "sender": {"name": rng.choice(["Allegro", "Zalando", "Empik", "Sklep Ąęść"])},
+        "receiver": {
+            "email": "odbiorca@example.com",
+            "phoneNumber": {"prefix": "+48", "value": "600700800"},
+            "name": "Jan Kowalski",
+        },
+        "pickUpPoint": {
+            "name": f"WAW{index % 900:03d}M",
+            "location": {"latitude": 52.2 + rng.random() / 10, "longitude": 21.0 + rng.random() / 10},
+            "locationDescription": "Przy sklepie Żabka",
+            "openingHours": "24/7",
+            "addressDetails": {
+                "postCode": "00-001",
+                "city": "Warszawa",
+                "province": "mazowieckie",
+                "street": "Marszałkowska",
+                "buildingNumber": str(rng.randrange(1, 200)),
+            },
+            "virtual": 0,
+            "pointType": "PL",
+            "type": ["parcel_locker"],
+        },
+        "statusHistory": [
+            {"status": status, "date": f"2026-10-{day:02d}T08:{day:02d}:00.000Z"}
+            for day, status in enumerate(INPOST_STATUSES[: rng.randrange(1, 6)], start=1)
+        ],
+        "operations": {
+            "manualArchive": True,
+            "delete": False,
+            "collect": False,
+            "highlight": False,
+            "expandAvizo": False,
+            "refreshUntil": "2026-10-30T10:00:00.000Z",
+        },
+        "expiryDate": "2026-10-20T10:00:00.000Z",
+        "storedDate": "2026-10-17T10:00:00.000Z",
+        "pickUpDate": None,
+        "parcelSize": rng.choice(["A", "B", "C"]),
+    }
+
+
+def inpost_parcels(count: int, seed: int = 0) -> list[dict]:
+    """Return ``count`` InPost parcels with a deterministic mix of statuses."""
+    rng = random.Random(seed)
+    return [inpost_parcel(index, rng) for index in range(count)]
+
+
+def inpost_tracked_body(count: int, seed: int = 0) -> bytes:
+    """Return a UTF-8 encoded ``v4/parcels/tracked`` response body."""
+    payload = {
+        "updatedUntil": "2026-10-17T10:00:00.000Z",
+        "more": False,
+        "parcels": inpost_parcels(count, seed),
+    }
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+DHL_STATUSES = ["TT_MAG", "TT_EDWP", "TT_DWP", "TT_LK", "TT_AWI", "TT_OP"]
+
+
+def dhl_shipment(index: int, rng: random.Random) -> dict:
+    """Return one shipment shaped like a DHL incoming list entry."""
+    return {
+        "shipmentNumber": f"JJD{index:018d}",
+        "status": rng.choice(DHL_STATUSES),
+        "statusDate": f"2026-10-{rng.randrange(1, 17):02d}T12:00:00",
+        "sender": {"name": rng.choice(["Allegro", "Zalando", "Empik"])},
+        "receiver": {"name": "Jan Kowalski", "city": "Kraków"},
+        "type": "PARCEL",
+        "isPickup": rng.random() < 0.3,
+    }
+
+
+def dhl_shipments(count: int, seed: int = 0) -> list[dict]:
+    """Return ``count`` DHL shipments with a deterministic mix of statuses."""
+    rng = random.Random(seed)
+    return [dhl_shipment(index, rng) for index in range(count)]
+
+
+DPD_STATUSES = [
+    "READY_TO_SEND",
+    "RECEIVED_FROM_SENDER",
+    "IN_TRANSPORT",
+    "RECEIVED_IN_DEPOT",
+    "HANDED_OVER_FOR_DELIVERY",
+    "READY_TO_PICK_UP",
+    "DELIVERED",
+]
+
+
+def dpd_package(index: int, rng: random.Random) -> dict:
+    """Return one package shaped like a DPD ``mdupackageservices`` entry."""
+    steps = DPD_STATUSES[: rng.randrange(1, len(DPD_STATUSES) + 1)]
+    return {
+        "waybill": f"1000{index:010d}U",
+        "main_status": {"status": steps[-1], "date": f"2026-10-{len(steps) + 9:02d}T09:00:00"},
+        "sender": {"name": rng.choice(["Allegro", "Zalando", "Empik"]), "city": "Poznań"},
+        "receiver": {"name": "Jan Kowalski", "city": "Gdańsk"},
+        "events": [
+            {"status": status, "date": f"2026-10-{day + 10:02d}T09:00:00", "place": "Oddział Poznań"}
+            for day, status in enumerate(steps)
+        ],
+    }
+
+
+def dpd_packages(count: int, seed: int = 0) -> list[dict]:
+    """Return ``count`` DPD packages with a deterministic mix of statuses."""
+    rng = random.Random(seed)
+    return [dpd_package(index, rng) for index in range(count)]
+
+
+POCZTEX_STATES = ["PRZYGOTOWANA", "NADANA", "W TRANSPORCIE", "W DORĘCZENIU", "AWIZOWANA", "P_OWU"]
+
+
+def pocztex_tracking(index: int, rng: random.Random) -> dict:
+    """Return one Pocztex ``/tracking`` list entry."""
+    return {
+        "trackingId": f"PX{index:011d}PL",
+        "state": rng.choice(POCZTEX_STATES),
+        "stateDate": f"2026-10-{rng.randrange(1, 17):02d}T11:00:00",
+        "senderName": rng.choice(["Allegro", "Empik", "Urząd Skarbowy"]),
+        "recipientName": "Jan Kowalski",
+        "direction": "IN",
+    }
+
+
+def pocztex_details(parcel: dict) -> dict:
+    """Return the ``/tracking/{id}/details`` body for a list entry."""
+    steps = POCZTEX_STATES[: POCZTEX_STATES.index(parcel["state"]) + 1]
+    return {
+        **parcel,
+        "pickupDate": None,
+        "history": [
+            {"state": state, "stateDate": f"2026-10-{day + 1:02d}T11:00:00", "place": "UP Kraków 1"}
+            for day, state in enumerate(steps)
+        ],
+    }
+
+
+def pocztex_trackings(count: int, seed: int = 0) -> list[dict]:
+    """Return ``count`` Pocztex list entries with a deterministic mix of states."""
+    rng = random.Random(seed)
+    return [pocztex_tracking(index, rng) for index in range(count)]
+
+
+# Generator and status field per courier, for suites covering all of them.
+GENERATORS = {
+    "inpost": (inpost_parcels, "status", INPOST_STATUSES),
+    "dpd": (dpd_packages, "main_status", DPD_STATUSES),
+    "dhl": (dhl_shipments, "status", DHL_STATUSES),
+    "pocztex": (pocztex_trackings, "state", POCZTEX_STATES),
+}
+
+
+def courier_items(courier: str, count: int, seed: int = 0) -> list[dict]:
+    """Return ``count`` list entries of ``courier``."""
+    return GENERATORS[courier][0](count, seed)
+
+
+def churned(courier: str, items: list[dict], share: float, seed: int = 1) -> list[dict]:
+    """Return the next refresh of ``items``: ``share`` of them changed status,
+    as many dropped and as many new ones appended."""
+    generate, key, statuses = GENERATORS[courier]
+    rng = random.Random(seed)
+    changes = int(len(items) * share)
+    result = []
+    for item in items[changes:]:
+        if rng.random() < share:
+            item = dict(item)
+            if key == "main_status":
+                item[key] = {**item[key], "status": rng.choice(statuses)}
+            else:
+                item[key] = rng.choice(statuses)
+        result.append(item)
+    # New entries get numbers past the original range.
+    fresh = generate(len(items) + changes, seed)[len(items):]
+    return result + fresh
@@ -0,0 +1,194 @@
+"""Refresh throughput and tail latency against the mock courier server.
+
+Simulates ``--accounts`` accounts per courier, each refreshing
+``--refreshes`` times in a row, all accounts concurrently. A refresh runs
+ShipmentCoordinator's own update path, bound to a lightweight stand-in: the
+circuit breaker, the token refresh and retry on a 401, the 304 short-circuit,
+the Pocztex detail cache and building the parcel records. Between rounds a
+share of the parcels changes status, so ETag hits and misses both show up.
+Refreshes follow each other without waiting for the scheduled interval, so
+once the courier's circuit breaker opens the rest fail fast as they would.
+
+Run from the repository root (requires Home Assistant to be installed):
+
+    python benchmarks/refresh_load.py [--couriers inpost,dhl] [--accounts 20]
+        [--parcels 50] [--latency lognormal:0.08,0.5] [--error-rate 0.02]
+        [--rate-limit-rate 0.01] [--auth-failure-rate 0.01] [--token-ttl 120]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.mock_server import COURIERS, MockCourierServer  # noqa: E402
+from homeassistant.helpers.update_coordinator import UpdateFailed  # noqa: E402
+from custom_components.polish_shipment_tracking import api_helpers  # noqa: E402
+from custom_components.polish_shipment_tracking.api_dhl import DhlApi  # noqa: E402
+from custom_components.polish_shipment_tracking.api_dpd import DpdApi  # noqa: E402
+from custom_components.polish_shipment_tracking.api_inpost import InPostApi  # noqa: E402
+from custom_components.polish_shipment_tracking.api_pocztex import PocztexApi  # noqa: E402
+from custom_components.polish_shipment_tracking.circuit_breaker import (  # noqa: E402
+    get_circuit_breaker,
+)
+from custom_components.polish_shipment_tracking.coordinator import (  # noqa: E402
+    DEFAULT_POLL_INTERVAL,
+    ShipmentCoordinator,
+)
+
+API_CLASSES = {"inpost": InPostApi, "dpd": DpdApi, "dhl": DhlApi, "pocztex": PocztexApi}
+
+
+class LoadCoordinator:
+    """ShipmentCoordinator's refresh path without the HA plumbing."""
+
+    _async_update_data = ShipmentCoordinator._async_update_data
+    _fetch_parcels_with_retry = ShipmentCoordinator._fetch_parcels_with_retry
+    _fetch_parcels = ShipmentCoordinator._fetch_parcels
+    _refresh_token = ShipmentCoordinator._refresh_token
+    _parcel_list_unchanged = ShipmentCoordinator._parcel_list_unchanged
+    _set_parcels = ShipmentCoordinator._set_parcels
+    _save_snapshot = ShipmentCoordinator._save_snapshot
+    _schedule_next_poll = ShipmentCoordinator._schedule_next_poll
+    _schedule_backoff = ShipmentCoordinator._schedule_backoff
+    _schedule_retry = ShipmentCoordinator._schedule_retry
+    _schedule_preconnect = ShipmentCoordinator._schedule_preconnect
+    active_ids = ShipmentCoordinator.active_ids
+
+    def __init__(self, api, courier: str) -> None:
+        self.api = api
+        self.courier = courier
+        self.data = None
+        self.parcels_by_id: dict = {}
+        self.previous_parcels_by_id: dict = {}
+        self.active_counts: Counter[str] = Counter()
+        self.added_ids: set[str] = set()
+        self.removed_ids: set[str] = set()
+        self.changed_ids: set[str] = set()
+        self._active_fingerprints: dict[str, str] = {}
+        self.poll_interval = self.update_interval = DEFAULT_POLL_INTERVAL
+        self.poll_reason = "startup"
+        self.circuit_breaker = get_circuit_breaker(courier)
+        self._failures = 0
+        self._courier_session = None
+        self._snapshot_store = SimpleNamespace(async_delay_save=lambda data_func, delay: None)
+        self._saved_fingerprints = None
+        self._saved_at = 0.0
+        self.timeline = SimpleNamespace(record=lambda parcels: None)
+
+    def _save_tokens(self) -> None:
+        """Tokens stay in the client; there are no config entries to update."""
+
+
+async def run_account(coordinator: LoadCoordinator, refreshes: int, results: dict) -> None:
+    for _ in range(refreshes):
+        previous = coordinator.data
+        start = time.perf_counter()
+        try:
+            coordinator.data = await coordinator._async_update_data()
+        except UpdateFailed as err:
+            # Requests skipped by an open circuit breaker have no cause.
+            cause = err.__context__
+            results["errors"][type(cause).__name__ if cause else "CircuitOpen"] += 1
+        else:
+            results["ok"] += 1
+            if previous is not None and coordinator.data is previous:
+                results["unchanged"] += 1
+        results["latencies"].append(time.perf_counter() - start)
+
+
+def percentile(values: list[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+async def main(args: argparse.Namespace) -> int:
+    couriers = [c for c in args.couriers.split(",") if c]
+    if not args.verbose:
+        # Injected failures would otherwise flood the output with API errors.
+        logging.getLogger("custom_components").setLevel(logging.CRITICAL)
+    server = MockCourierServer(
+        parcels=args.parcels,
+        page_size=args.page_size,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        auth_failure_rate=args.auth_failure_rate,
+        token_ttl=args.token_ttl,
+        seed=args.seed,
+    )
+    if not args.host_limits:
+        # Every mock courier shares one host; do not let the per-host
+        # limiter serialize accounts that would hit different servers.
+        api_helpers.HOST_LIMITS["localhost"] = (10_000, 1e9, 10_000)
+
+    async with server, aiohttp.ClientSession() as session:
+        print(f"Mock server on {server.url}")
+        print(
+            f"{'courier':>8} {'ok':>6} {'304':>6} {'failed':>6} {'refresh/s':>9}"
+            f" {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}  errors"
+        )
+        for courier in couriers:
+            coordinators = []
+            for _ in range(args.accounts):
+                api = API_CLASSES[courier](session)
+                server.point_api_at(api, courier)
+                server.seed_api(api, courier)
+                coordinators.append(LoadCoordinator(api, courier))
+            results = {"ok": 0, "unchanged": 0, "errors": Counter(), "latencies": []}
+            start = time.perf_counter()
+            for _ in range(args.rounds):
+                await asyncio.gather(
+                    *(
+                        run_account(coordinator, args.refreshes, results)
+                        for coordinator in coordinators
+                    )
+                )
+                server.advance(args.churn)
+            elapsed = time.perf_counter() - start
+            latencies = results["latencies"]
+            failed = sum(results["errors"].values())
+            print(
+                f"{courier:>8} {results['ok']:>6} {results['unchanged']:>6} {failed:>6}"
+                f" {len(latencies) / elapsed:>9.1f}"
+                f" {statistics.median(latencies) * 1e3:>8.1f}"
+                f" {percentile(latencies, 0.95) * 1e3:>8.1f}"
+                f" {percentile(latencies, 0.99) * 1e3:>8.1f}"
+                f" {max(latencies) * 1e3:>8.1f}  {dict(results['errors']) or '-'}"
+            )
+        if args.verbose:
+            for key, count in sorted(server.stats.items()):
+                print(f"  {count:>7}  {key}")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--couriers", default=",".join(COURIERS))
+    parser.add_argument("--accounts", type=int, default=20)
+    parser.add_argument("--refreshes", type=int, default=5, help="per account and round")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--churn", type=float, default=0.1, help="share of parcels changed per round")
+    parser.add_argument("--parcels", type=int, default=50)
+    parser.add_argument("--page-size", type=int, default=20)
+    parser.add_argument("--latency", default="lognormal:0.02,0.5")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--auth-failure-rate", type=float, default=0.0)
+    parser.add_argument("--token-ttl", type=float, default=3600.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--host-limits", action="store_true", help="keep the per-host request limits")
+    parser.add_argument("--verbose", action="store_true", help="log API errors and print per-endpoint server counters")
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -1,16 +1,29 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, CoreState, EVENT_HOMEASSISTANT_STARTED
+from homeassistant.core import (
+    HomeAssistant,
+    CoreState,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_HOMEASSISTANT_STOP,
+    callback,
+)
 from homeassistant.helpers import config_validation as cv
-from homeassistant.components import websocket_api
-import voluptuous as vol
-
-from .const import DOMAIN, PLATFORMS, INTEGRATION_VERSION
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import (
+    DOMAIN,
+    PLATFORMS,
+    SIGNAL_PARCELS_UPDATED,
+)
+from .credentials import async_get_credential_store
 from .frontend import JSModuleRegistration
-from .coordinator import ShipmentCoordinator
+from .coordinator import AccountView, ShipmentCoordinator, account_key, snapshot_store
+from .timeline import timeline_store
+from .websocket import async_register_websocket_commands
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -25,18 +38,16 @@ async def async_setup(hass: HomeAssistant, config: dict):
         module_register = JSModuleRegistration(hass)
         await module_register.async_register()
 
-    # Websocket handler to expose the integration version to the frontend.
-    @websocket_api.websocket_command({vol.Required("type"): f"{DOMAIN}/version"})
-    @websocket_api.async_response
-    async def websocket_get_version(
-        hass: HomeAssistant,
-        connection: websocket_api.ActiveConnection,
-        msg: dict,
-    ) -> None:
-        """Handle version requests from the frontend."""
-        connection.send_result(msg["id"], {"version": INTEGRATION_VERSION})
+    async_register_websocket_commands(hass)
+
+    credentials = async_get_credential_store(hass)
+
+    @callback
+    def async_flush_credentials(_event) -> None:
+        """Write queued tokens before the config entries are saved on shutdown."""
+        credentials.async_flush()
 
-    websocket_api.async_register_command(hass, websocket_get_version)
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_flush_credentials)
 
     # Schedule frontend registration based on HA state.
     if hass.state == CoreState.running:
@@ -48,20 +59,130 @@ async def async_setup(hass: HomeAssistant, config: dict):
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up from a config entry."""
-    coordinator = ShipmentCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
-
-    hass.data[DOMAIN][entry.entry_id] = coordinator
+    domain_data = hass.data[DOMAIN]
+    accounts: dict = domain_data.setdefault("_accounts", {})
+    key = account_key(entry)
+
+    # Entries of one account may be set up concurrently; only the first one
+    # creates the coordinator.
+    lock = domain_data.setdefault("_account_locks", {}).setdefault(key, asyncio.Lock())
+    # Entries reloaded to take over the coordinator of an unloaded owner.
+    taking_over: dict = domain_data.setdefault("_taking_over", {})
+    async with lock:
+        coordinator = accounts.get(key) if key is not None else None
+        warm_start = False
+        if coordinator is None:
+            coordinator = ShipmentCoordinator(hass, entry)
+            await coordinator.timeline.async_load()
+            # Start from the last saved parcels when there are any, so setup
+            # does not wait for the courier; a refresh follows below.
+            warm_start = await coordinator.async_load_snapshot()
+            if not warm_start:
+                try:
+                    await coordinator.async_config_entry_first_refresh()
+                except Exception:
+                    # Setup is retried with a new coordinator; release its session.
+                    await coordinator.async_shutdown()
+                    raise
+            if key is not None:
+                accounts[key] = coordinator
+        elif taking_over.pop(entry.entry_id, None) is coordinator:
+            _LOGGER.info(
+                "%s takes over its %s account", entry.title, coordinator.courier
+            )
+        else:
+            _LOGGER.info(
+                "%s shares its %s account with %s, reusing its data",
+                entry.title,
+                coordinator.courier,
+                coordinator.entry.title,
+            )
+            coordinator.entries.append(entry)
+
+    view = AccountView(coordinator, entry)
+    hass.data[DOMAIN][entry.entry_id] = view
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    if view.is_primary:
+        entry.async_on_unload(entry.add_update_listener(async_options_updated))
+        # Registered after the sensor platform so subscribers see new entities.
+        entry.async_on_unload(
+            coordinator.async_add_listener(
+                lambda: async_dispatcher_send(hass, SIGNAL_PARCELS_UPDATED)
+            )
+        )
+        async_dispatcher_send(hass, SIGNAL_PARCELS_UPDATED)
+
+    if warm_start:
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh(),
+            f"{DOMAIN} refresh after warm start {entry.entry_id}",
+        )
     
     return True
 
+async def async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload when an option fixed at setup changed; other updates are read live."""
+    view = hass.data[DOMAIN].get(entry.entry_id)
+    if not isinstance(view, AccountView):
+        return
+    coordinator = view.coordinator
+    # Unchanged parcels skip their state write and would keep the old
+    # attributes, so the raw response option needs a new coordinator too.
+    if not coordinator.uses_options_of(entry):
+        # Retire the coordinator so the reload sets the account up again
+        # instead of handing it over.
+        accounts = hass.data[DOMAIN].get("_accounts", {})
+        if accounts.get(account_key(entry)) is coordinator:
+            del accounts[account_key(entry)]
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+
+async def _async_release_account(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: ShipmentCoordinator
+) -> None:
+    """Hand the coordinator of an unloaded owner to the next entry of its account."""
+    accounts = hass.data[DOMAIN].get("_accounts", {})
+    key = account_key(entry)
+    successor = coordinator.entries[0] if coordinator.entries else None
+    if (
+        successor is not None
+        and accounts.get(key) is coordinator
+        and coordinator.uses_options_of(successor)
+    ):
+        _LOGGER.info(
+            "%s hands its %s account over to %s",
+            entry.title,
+            coordinator.courier,
+            successor.title,
+        )
+        coordinator.hand_over(successor)
+        hass.data[DOMAIN]["_taking_over"][successor.entry_id] = coordinator
+        # The entities went away with the previous owner; the successor
+        # creates them again when it is set up.
+        hass.config_entries.async_schedule_reload(successor.entry_id)
+        return
+    # Drop the coordinator and let the remaining entries set the account up
+    # again, the first of them taking over.
+    if accounts.get(key) is coordinator:
+        del accounts[key]
+    await coordinator.async_shutdown()
+    for other in coordinator.entries:
+        hass.config_entries.async_schedule_reload(other.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
+    async_get_credential_store(hass).async_flush(entry.entry_id)
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        view: AccountView = hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = view.coordinator
+        if hass.data[DOMAIN].get("_taking_over", {}).get(entry.entry_id) is not coordinator:
+            coordinator.entries.remove(entry)
+            if view.is_primary:
+                await _async_release_account(hass, entry, coordinator)
+        async_dispatcher_send(hass, SIGNAL_PARCELS_UPDATED)
 
     # If no more entries, unregister frontend? 
     # Actually, keep it for now as there might be other entries.
@@ -69,3 +190,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     
     return unload_ok
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the stored parcel snapshot and timelines of a removed entry."""
+    coordinator = hass.data[DOMAIN].get("_taking_over", {}).pop(entry.entry_id, None)
+    if coordinator is not None:
+        # Deleted before it could take the account over.
+        coordinator.entries.remove(entry)
+        await _async_release_account(hass, entry, coordinator)
+    await snapshot_store(hass, entry.entry_id).async_remove()
+    await timeline_store(hass, entry.entry_id).async_remove()
@@ -1,17 +1,88 @@
 import aiohttp
-from .api_helpers import normalize_phone, request_json
+import asyncio
+import logging
+import time
+
+from yarl import URL
+
+from .api_helpers import (
+    ResponseCache,
+    SingleFlight,
+    normalize_phone,
+    request_json,
+    token_expires_at,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Pagination metadata names seen on list responses, top level or nested.
+_PAGE_COUNT_KEYS = ("totalPages", "pageCount", "pagesCount", "lastPage")
+_TOTAL_KEYS = ("totalElements", "totalCount", "totalItems", "total")
+_PAGINATION_CONTAINERS = ("pagination", "paging", "meta", "pageInfo")
+
+
+def _page_count(data, page_size: int) -> int:
+    """Return how many pages the list has, from the first page's metadata."""
+    if not isinstance(data, dict):
+        return 1
+    sources = [data] + [
+        data[key] for key in _PAGINATION_CONTAINERS if isinstance(data.get(key), dict)
+    ]
+    for source in sources:
+        for key in _PAGE_COUNT_KEYS:
+            value = source.get(key)
+            if isinstance(value, int) and value > 0:
+                return value
+    for source in sources:
+        for key in _TOTAL_KEYS:
+            value = source.get(key)
+            if isinstance(value, int) and value > 0 and page_size:
+                return -(-value // page_size)
+    return 1
 
 
 class DhlApi:
     BASE_URL = "https://mojdhl.pl/api/dhl/public"
+    # Pages requested at the same time after the first one.
+    PAGE_PREFETCH_LIMIT = 4
+    # Upper bound in case the metadata is off.
+    MAX_PAGES = 50
 
     def __init__(self, session: aiohttp.ClientSession, device_id: str | None = None):
         self._session = session
         self._token = None
-        self._cookies = {}
+        self._expires_at = 0
+        self._refresh_flight = SingleFlight()
+        # Per-account cookies. They only stay per account when the session
+        # stores none itself (see http_session.async_get_cookieless_session);
+        # aiohttp merges a session jar's cookies into every request.
+        self._cookie_jar = aiohttp.CookieJar()
         self._device_id = device_id
+        self.response_cache = ResponseCache()
+        # Whether every page of the last iter_parcels run was a 304.
+        self.list_unchanged = False
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        data: dict | None = None,
+        cache: ResponseCache | None = None,
+        ensure_token: bool = True,
+    ):
+        # Recover a new token shortly before it expires instead of after a 401
+        if (
+            ensure_token
+            and self._token
+            and self._device_id
+            and self._expires_at
+            and time.time() > self._expires_at - 60
+        ):
+            try:
+                await self.refresh_token()
+            except Exception as err:
+                _LOGGER.warning("Early DHL token refresh failed: %s", err)
 
-    async def request(self, method: str, path: str, data: dict | None = None):
         url = f"{self.BASE_URL}/{path.lstrip('/')}"
         headers = {
             "Content-Type": "application/json",
@@ -23,17 +94,15 @@ class DhlApi:
         if self._token:
             headers["Authorization"] = f"Bearer {self._token}"
 
-        # Include any stored cookies in the request
-        cookie_header = "; ".join([f"{k}={v}" for k, v in self._cookies.items()])
-        if cookie_header:
-            headers["Cookie"] = cookie_header
+        # Send the cookies the jar holds for this URL (domain, path, expiry)
+        cookies = self._cookie_jar.filter_cookies(URL(url))
+        if cookies:
+            headers["Cookie"] = "; ".join(
+                f"{name}={morsel.value}" for name, morsel in cookies.items()
+            )
 
         def _capture_cookies(resp):
-            if "Set-Cookie" in resp.headers:
-                for cookie in resp.headers.getall("Set-Cookie", []):
-                    parts = cookie.split(";", 1)[0].split("=", 1)
-                    if len(parts) == 2:
-                        self._cookies[parts[0]] = parts[1]
+            self._cookie_jar.update_cookies(resp.cookies, resp.url)
 
         return await request_json(
             self._session,
@@ -45,8 +114,17 @@ class DhlApi:
             log_401_as_info=True,
             error_with_text=True,
             on_response=_capture_cookies,
+            cache=cache,
         )
 
+    def export_cookies(self) -> dict[str, str]:
+        """Return the account's cookies as a name to value mapping."""
+        return {morsel.key: morsel.value for morsel in self._cookie_jar}
+
+    def restore_cookies(self, cookies: dict[str, str]) -> None:
+        """Load cookies saved with ``export_cookies``."""
+        self._cookie_jar.update_cookies(cookies, URL(self.BASE_URL))
+
     async def validate_account(self, phone):
         return await self.request(
             "POST",
@@ -81,10 +159,15 @@ class DhlApi:
             },
         )
         self._token = data.get("accessToken") or data.get("data", {}).get("accessToken")
+        self._expires_at = token_expires_at(self._token, data)
         return data
 
     async def refresh_token(self):
-        """Refresh the DHL token using the auth/recover endpoint."""
+        """Refresh the DHL token; concurrent callers share one refresh."""
+        return await self._refresh_flight.run(self._refresh_token_once)
+
+    async def _refresh_token_once(self):
+        """Recover a new token using the auth/recover endpoint."""
         if not self._device_id:
             raise Exception("Device ID required for DHL refresh")
 
@@ -94,22 +177,59 @@ class DhlApi:
         }
 
         if self._token:
-            self._cookies["access-token"] = self._token
+            self._cookie_jar.update_cookies(
+                {"access-token": self._token}, URL(self.BASE_URL)
+            )
 
-        data = await self.request("POST", "auth/recover", data=payload)
+        data = await self.request("POST", "auth/recover", data=payload, ensure_token=False)
 
         new_token = data.get("accessToken") or data.get("data", {}).get("accessToken")
         if new_token:
             self._token = new_token
+            self._expires_at = token_expires_at(new_token, data)
         return data
 
-    async def get_parcels(self):
+    async def get_parcels(self, page: int = 1):
         return await self.request(
             "POST",
-            "user/shipment/v2.1/list/incoming/active/1",
+            f"user/shipment/v2.1/list/incoming/active/{page}",
             {
                 "shipmentFilterTypes": [],
                 "shipmentFilterStatuses": [],
-                "page": 1,
+                "page": page,
             },
+            cache=self.response_cache,
         )
+
+    async def iter_parcels(self):
+        """Yield the shipments of every incoming list page, in page order.
+
+        The page count comes from the first page; the remaining pages are
+        then fetched concurrently, at most ``PAGE_PREFETCH_LIMIT`` at a time,
+        while earlier pages are already being consumed.
+        """
+        self.list_unchanged = False
+        hits = self.response_cache.hits
+        first = await self.get_parcels(1)
+        shipments = first.get("shipments", []) if isinstance(first, dict) else []
+        pages = min(_page_count(first, len(shipments)), self.MAX_PAGES)
+
+        semaphore = asyncio.Semaphore(self.PAGE_PREFETCH_LIMIT)
+
+        async def _fetch(page):
+            async with semaphore:
+                return await self.get_parcels(page)
+
+        tasks = [asyncio.ensure_future(_fetch(page)) for page in range(2, pages + 1)]
+        try:
+            for shipment in shipments:
+                yield shipment
+            for task in tasks:
+                data = await task
+                for shipment in data.get("shipments", []) if isinstance(data, dict) else []:
+                    yield shipment
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self.list_unchanged = self.response_cache.hits - hits == pages
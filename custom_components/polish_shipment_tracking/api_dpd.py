@@ -3,7 +3,7 @@ import logging
 import time
 import urllib.parse
 
-from .api_helpers import normalize_phone, request_json
+from .api_helpers import ResponseCache, SingleFlight, normalize_phone, request_json
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -18,8 +18,12 @@ class DpdApi:
         self._token = None
         self._refresh_token = None
         self._expires_at = 0
+        self._refresh_flight = SingleFlight()
+        self.response_cache = ResponseCache()
+        # Whether the last parcel list request was answered with a 304.
+        self.list_unchanged = False
 
-    async def request(self, method, url, data=None, headers=None, form_data=None):
+    async def request(self, method, url, data=None, headers=None, form_data=None, cache=None):
         if headers is None:
             headers = {}
 
@@ -51,6 +55,7 @@ class DpdApi:
             label="DPD",
             log_401_as_info=True,
             error_with_text=False,
+            cache=cache,
         )
 
     async def send_sms_code(self, phone_number):
@@ -88,6 +93,10 @@ class DpdApi:
         return token_data
 
     async def refresh_access_token(self):
+        """Refresh the access token; concurrent callers share one refresh."""
+        return await self._refresh_flight.run(self._refresh_access_token_once)
+
+    async def _refresh_access_token_once(self):
         if not self._refresh_token:
             raise Exception("Missing DPD refresh token")
 
@@ -98,14 +107,19 @@ class DpdApi:
             "client_id": self.CLIENT_ID,
         }
         try:
-            async with self._session.post(url, data=form_data) as resp:
-                if resp.status != 200:
-                    text = await resp.text()
-                    raise Exception(f"DPD refresh failed: {resp.status} {text}")
-                data = await resp.json()
-                if not data.get("access_token"):
-                    raise Exception("DPD refresh failed: missing access_token")
-                self._save_token_data(data)
+            data = await request_json(
+                self._session,
+                "POST",
+                url,
+                data=form_data,
+                headers={"Accept": "application/json", "User-Agent": "DPD Mobile"},
+                label="DPD",
+                log_401_as_info=True,
+                error_with_text=True,
+            )
+            if not isinstance(data, dict) or not data.get("access_token"):
+                raise Exception("DPD refresh failed: missing access_token")
+            self._save_token_data(data)
         except Exception as e:
             _LOGGER.error("DPD Token refresh failed: %s", e)
             raise
@@ -124,4 +138,10 @@ class DpdApi:
             "X-Mobile-Version": "2.10.2",
         }
         payload = {"alias": None, "sent": None}
-        return await self.request("POST", url, data=payload, headers=headers)
+        self.list_unchanged = False
+        hits = self.response_cache.hits
+        data = await self.request(
+            "POST", url, data=payload, headers=headers, cache=self.response_cache
+        )
+        self.list_unchanged = self.response_cache.hits > hits
+        return data
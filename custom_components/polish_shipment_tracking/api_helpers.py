@@ -1,13 +1,377 @@
 import aiohttp
 import asyncio
 import async_timeout
+import base64
+from collections import OrderedDict
+from datetime import datetime, timezone
+import email.utils
 import json
 import logging
 import re
+import time
+import yarl
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson ships with Home Assistant
+    orjson = None
 
 
 _LOGGER = logging.getLogger(__name__)
 
+# Upper bound for a single response body; courier APIs answer in kilobytes.
+DEFAULT_MAX_BODY_SIZE = 8 * 1024 * 1024
+# How much of an error body ends up in logs and exception messages.
+ERROR_BODY_LOG_LIMIT = 512
+_READ_CHUNK_SIZE = 64 * 1024
+
+
+def _stdlib_loads(body):
+    return json.loads(body)
+
+
+# Decoders take the raw body bytes and raise ValueError on invalid JSON.
+# orjson parses straight from bytes without building an intermediate str.
+json_loads = orjson.loads if orjson is not None else _stdlib_loads
+
+
+class ApiError(Exception):
+    """A courier API request failed.
+
+    ``status`` is the HTTP status when there was a response, ``retryable``
+    tells whether the same request may succeed later without user action
+    and ``retry_after`` is the server's requested delay in seconds.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        *,
+        status: int | None = None,
+        retryable: bool = False,
+        retry_after: float | None = None,
+    ):
+        super().__init__(message)
+        self.status = status
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class ApiAuthError(ApiError):
+    """The API rejected the credentials; a token refresh may help."""
+
+
+class ApiRateLimitError(ApiError):
+    """The API asked us to slow down (429/503 or an active host backoff)."""
+
+
+class ApiConnectionError(ApiError):
+    """The API could not be reached or did not answer in time."""
+
+
+def api_error_for_status(message: str, status: int, body: str = "", retry_after=None) -> ApiError:
+    """Return the ApiError subclass matching an HTTP error response."""
+    if status == 401 or "unauthorized" in body.lower():
+        return ApiAuthError(message, status=status)
+    if status in RATE_LIMIT_STATUSES:
+        return ApiRateLimitError(message, status=status, retryable=True, retry_after=retry_after)
+    return ApiError(message, status=status, retryable=status >= 500 or status == 408)
+
+
+class ResponseTooLarge(Exception):
+    """Raised when a response body exceeds the configured size cap."""
+
+
+def _truncate(text: str, limit: int = ERROR_BODY_LOG_LIMIT) -> str:
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... ({len(text)} chars)"
+
+
+def _decode_text(resp: aiohttp.ClientResponse, body: bytes) -> str:
+    try:
+        return body.decode(resp.charset or "utf-8", errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+async def _read_body(resp: aiohttp.ClientResponse, max_size: int | None) -> bytes:
+    """Read the body as bytes, aborting as soon as it exceeds ``max_size``."""
+    if max_size is None:
+        return await resp.read()
+    length = resp.content_length
+    if length is not None and length > max_size:
+        raise ResponseTooLarge(f"{length} bytes declared, limit is {max_size}")
+    chunks = []
+    total = 0
+    async for chunk in resp.content.iter_chunked(_READ_CHUNK_SIZE):
+        total += len(chunk)
+        if total > max_size:
+            raise ResponseTooLarge(f"more than {max_size} bytes received")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+class ResponseCache:
+    """Per-client store of validators and parsed bodies for conditional requests.
+
+    When a cached entry has an ``ETag`` or ``Last-Modified`` validator the
+    next identical request sends ``If-None-Match``/``If-Modified-Since``, and
+    a ``304 Not Modified`` answer returns the previously parsed object (the
+    very same instance). ``hits`` counts those answers, so a caller can tell
+    whether its own request was one of them.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self._entries = OrderedDict()
+        self._max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(method, url, params=None, json_data=None):
+        params_key = tuple(sorted((str(k), str(v)) for k, v in params.items())) if params else None
+        body_key = json.dumps(json_data, sort_keys=True, default=str) if json_data is not None else None
+        return (method.upper(), str(url), params_key, body_key)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def conditional_headers(self, key) -> dict:
+        entry = self.get(key)
+        if entry is None:
+            return {}
+        etag, last_modified, _ = entry
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    def store(self, key, etag, last_modified, data) -> None:
+        self.misses += 1
+        if not etag and not last_modified:
+            self._entries.pop(key, None)
+            return
+        self._entries[key] = (etag, last_modified, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+    def hit(self, key):
+        """Record a 304 for ``key`` and return the cached object."""
+        self.hits += 1
+        return self._entries[key][2]
+
+
+# --- Per-host limits ---
+# Requests to one host share a limiter for the whole process, so every
+# config entry of a courier draws from the same budget.
+DEFAULT_MAX_IN_FLIGHT = 4
+DEFAULT_REQUEST_RATE = 5.0  # requests per second
+DEFAULT_REQUEST_BURST = 10
+# host -> (max_in_flight, rate, burst), overriding the defaults above.
+HOST_LIMITS: dict[str, tuple[int, float, int]] = {}
+
+RATE_LIMIT_STATUSES = frozenset({429, 503})
+RATE_LIMIT_RETRIES = 1
+# Backoff applied when a 429/503 carries no usable Retry-After.
+DEFAULT_RETRY_AFTER = 5.0
+# Longest backoff a request waits out instead of failing right away.
+MAX_RATE_LIMIT_WAIT = 30.0
+
+_HOST_LIMITERS: dict = {}
+
+
+class RateLimited(Exception):
+    """Raised when a host is backing off for longer than a request may wait."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class HostLimiter:
+    """Bounds in-flight requests and request rate for one host.
+
+    Used as an async context manager around a single request. Entry waits
+    for a free slot, for any ``Retry-After`` backoff and for a token of the
+    token bucket, in that order.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+        rate: float = DEFAULT_REQUEST_RATE,
+        burst: int = DEFAULT_REQUEST_BURST,
+    ):
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    def back_off(self, delay: float) -> None:
+        """Hold further requests to this host for ``delay`` seconds."""
+        self._blocked_until = max(self._blocked_until, time.monotonic() + delay)
+
+    async def _wait_turn(self) -> None:
+        while True:
+            now = time.monotonic()
+            blocked = self._blocked_until - now
+            if blocked > 0:
+                if blocked > MAX_RATE_LIMIT_WAIT:
+                    raise RateLimited(blocked)
+                await asyncio.sleep(blocked)
+                continue
+            self._tokens = min(self._burst, self._tokens + (now - self._updated) * self._rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            await self._wait_turn()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self._semaphore.release()
+
+
+def get_host_limiter(url) -> HostLimiter:
+    """Return the process-wide limiter for the host of ``url``."""
+    host = yarl.URL(str(url)).host or ""
+    limiter = _HOST_LIMITERS.get(host)
+    if limiter is None:
+        limiter = _HOST_LIMITERS[host] = HostLimiter(*HOST_LIMITS.get(host, ()))
+    return limiter
+
+
+def parse_retry_after(value: str | None, default: float = DEFAULT_RETRY_AFTER) -> float:
+    """Return the delay in seconds from a ``Retry-After`` header value."""
+    if not value:
+        return default
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class SingleFlight:
+    """Runs one call of a coroutine function at a time.
+
+    Callers arriving while a call is in flight await that same call and get
+    its result or exception, instead of starting their own. Used for token
+    refreshes, where concurrent refreshes would race on rotating tokens.
+    """
+
+    def __init__(self):
+        self._task: asyncio.Task | None = None
+
+    async def run(self, func):
+        task = self._task
+        if task is None:
+            task = self._task = asyncio.ensure_future(func())
+            task.add_done_callback(self._clear)
+        # A cancelled waiter must not cancel the call the others wait for.
+        return await asyncio.shield(task)
+
+    def _clear(self, task) -> None:
+        if self._task is task:
+            self._task = None
+
+
+class DetailCache:
+    """Per-item detail payloads reused until the item visibly changes.
+
+    Entries are keyed by item ID and remember a fingerprint of the list
+    entry they were fetched for. A lookup hits while the fingerprint matches
+    and the entry is younger than ``ttl``; entries flagged terminal are
+    reused for as long as the item stays listed. Failed lookups are cached
+    as negative results and retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 6 * 3600,
+        failure_backoff: float = 300,
+        max_failure_backoff: float = 6 * 3600,
+    ):
+        self._ttl = ttl
+        self._failure_backoff = failure_backoff
+        self._max_failure_backoff = max_failure_backoff
+        # key -> (fingerprint, details, fetched_at, terminal)
+        self._entries = {}
+        # key -> (fingerprint, retry_at, failures)
+        self._failures = {}
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+
+    def get(self, key, fingerprint):
+        """Return ``(True, details)`` on a hit, ``(True, None)`` while a failure
+        is backing off, and ``(False, None)`` when the details must be fetched."""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            cached_fingerprint, details, fetched_at, terminal = entry
+            if terminal or (
+                cached_fingerprint == fingerprint and now - fetched_at < self._ttl
+            ):
+                self.hits += 1
+                return True, details
+        failure = self._failures.get(key)
+        if failure is not None and failure[0] == fingerprint and now < failure[1]:
+            self.negative_hits += 1
+            return True, None
+        self.misses += 1
+        return False, None
+
+    def store(self, key, fingerprint, details, terminal: bool = False) -> None:
+        self._failures.pop(key, None)
+        self._entries[key] = (fingerprint, details, time.monotonic(), terminal)
+
+    def store_failure(self, key, fingerprint) -> None:
+        failures = 1
+        previous = self._failures.get(key)
+        if previous is not None and previous[0] == fingerprint:
+            failures = previous[2] + 1
+        delay = min(
+            self._failure_backoff * 2 ** (failures - 1), self._max_failure_backoff
+        )
+        self._failures[key] = (fingerprint, time.monotonic() + delay, failures)
+
+    def retain(self, keys) -> None:
+        """Forget every item that is not in ``keys``."""
+        for store in (self._entries, self._failures):
+            for key in store.keys() - keys:
+                del store[key]
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "negative_hits": self.negative_hits,
+            "entries": len(self._entries),
+        }
+
 
 async def request_json(
     session: aiohttp.ClientSession,
@@ -24,52 +388,188 @@ async def request_json(
     log_401_as_info: bool = False,
     error_with_text: bool = True,
     on_response=None,
+    cache: ResponseCache | None = None,
+    decoder=None,
+    max_body_size: int | None = DEFAULT_MAX_BODY_SIZE,
 ):
     """
     Perform a request, parse JSON when possible, and apply consistent error handling.
 
     Returns parsed JSON when available, otherwise the raw response text.
+    With ``cache`` the request is made conditional on the cached validators
+    and a 304 answer returns the cached object. If that object was evicted
+    while the request was in flight, the request is sent once more without
+    the validators.
+
+    The body is read as bytes, capped at ``max_body_size`` (``None`` disables
+    the cap), and parsed with ``decoder`` (defaults to ``json_loads``).
+
+    Requests pass through the shared limiter of the target host. A 429 or
+    503 answer blocks that host for its ``Retry-After`` and is retried once
+    when the wait is short.
     """
     if headers is None:
         headers = {}
+    request_headers = headers
+    if decoder is None:
+        decoder = json_loads
     api_label = f"{label} API"
     error_label = f"{api_label} Error"
 
+    cache_key = None
+    conditional = None
+    if cache is not None:
+        cache_key = cache.make_key(method, url, params, json_data)
+        conditional = cache.conditional_headers(cache_key)
+        if conditional:
+            headers = {**headers, **conditional}
+
+    kwargs = {
+        "headers": headers,
+        "params": params,
+        "allow_redirects": allow_redirects,
+    }
+    if json_data is not None:
+        kwargs["json"] = json_data
+    if data is not None:
+        kwargs["data"] = data
+
+    limiter = get_host_limiter(url)
+    refetch = False
+    for attempt in range(RATE_LIMIT_RETRIES + 1):
+        try:
+            async with limiter, async_timeout.timeout(timeout):
+                async with session.request(method, url, **kwargs) as resp:
+                    if on_response:
+                        on_response(resp)
+
+                    if resp.status == 304 and cache_key is not None:
+                        if cache.get(cache_key):
+                            return cache.hit(cache_key)
+                        if not conditional:
+                            raise ApiError(
+                                f"{api_label} answered 304 to an unconditional request",
+                                status=304,
+                                retryable=True,
+                            )
+                        # Evicted since the validators were sent; leave the
+                        # host limiter before asking for the full body.
+                        refetch = True
+                        break
+
+                    retry_after = None
+                    if resp.status in RATE_LIMIT_STATUSES:
+                        delay = retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+                        limiter.back_off(delay)
+                        if attempt < RATE_LIMIT_RETRIES and delay <= MAX_RATE_LIMIT_WAIT:
+                            _LOGGER.warning(
+                                "%s answered %s, retrying in %.0fs", api_label, resp.status, delay
+                            )
+                            continue
+
+                    try:
+                        body = await _read_body(resp, max_body_size)
+                    except ResponseTooLarge as err:
+                        _LOGGER.error("%s response from %s too large: %s", api_label, url, err)
+                        raise ApiError(
+                            f"{api_label} response too large: {resp.status}", status=resp.status
+                        )
+
+                    if resp.status >= 400:
+                        text = _truncate(_decode_text(resp, body))
+                        if resp.status == 401 and log_401_as_info:
+                            _LOGGER.info("%s error %s: %s", label, resp.status, text)
+                        else:
+                            _LOGGER.error("%s error %s: %s", label, resp.status, text)
+                        if error_with_text:
+                            message = f"{error_label}: {resp.status} - {text}"
+                        else:
+                            message = f"{error_label}: {resp.status}"
+                        raise api_error_for_status(message, resp.status, text, retry_after)
+                    try:
+                        result = decoder(body)
+                    except ValueError:
+                        # Bytes decoders expect UTF-8; decode the declared
+                        # charset first and keep the text only if it is no JSON.
+                        result = _decode_text(resp, body)
+                        try:
+                            result = json.loads(result)
+                        except ValueError:
+                            pass
+                    if cache_key is not None:
+                        cache.store(
+                            cache_key,
+                            resp.headers.get("ETag"),
+                            resp.headers.get("Last-Modified"),
+                            result,
+                        )
+                    return result
+        except RateLimited as err:
+            _LOGGER.warning("%s is backing off for %.0fs", api_label, err.retry_after)
+            raise ApiRateLimitError(
+                f"{api_label} rate limited, retry in {err.retry_after:.0f}s",
+                retryable=True,
+                retry_after=err.retry_after,
+            )
+        except asyncio.TimeoutError:
+            _LOGGER.error("%s request to %s timed out", api_label, url)
+            raise ApiConnectionError(f"{api_label} request timed out", retryable=True)
+        except aiohttp.ClientError as err:
+            _LOGGER.error("%s client error: %s", api_label, err)
+            raise ApiConnectionError(f"{api_label} client error: {err}", retryable=True)
+
+    if refetch:
+        _LOGGER.debug("%s answered 304 for an evicted response, fetching it again", api_label)
+        return await request_json(
+            session,
+            method,
+            url,
+            json_data=json_data,
+            data=data,
+            headers=request_headers,
+            params=params,
+            allow_redirects=allow_redirects,
+            timeout=timeout,
+            label=label,
+            log_401_as_info=log_401_as_info,
+            error_with_text=error_with_text,
+            on_response=on_response,
+            cache=cache,
+            decoder=decoder,
+            max_body_size=max_body_size,
+        )
+
+
+def jwt_expiry(token) -> float | None:
+    """Return the ``exp`` claim of a JWT as a UNIX timestamp, if it has one.
+
+    The signature is not verified; the value is only used to schedule a
+    refresh before the server starts rejecting the token.
+    """
+    if not isinstance(token, str) or token.count(".") != 2:
+        return None
+    payload = token.split(".")[1]
     try:
-        async with async_timeout.timeout(timeout):
-            kwargs = {
-                "headers": headers,
-                "params": params,
-                "allow_redirects": allow_redirects,
-            }
-            if json_data is not None:
-                kwargs["json"] = json_data
-            if data is not None:
-                kwargs["data"] = data
-
-            async with session.request(method, url, **kwargs) as resp:
-                if on_response:
-                    on_response(resp)
-
-                text = await resp.text()
-                if resp.status >= 400:
-                    if resp.status == 401 and log_401_as_info:
-                        _LOGGER.info("%s error %s: %s", label, resp.status, text)
-                    else:
-                        _LOGGER.error("%s error %s: %s", label, resp.status, text)
-                    if error_with_text:
-                        raise Exception(f"{error_label}: {resp.status} - {text}")
-                    raise Exception(f"{error_label}: {resp.status}")
-                try:
-                    return json.loads(text)
-                except Exception:
-                    return text
-    except asyncio.TimeoutError:
-        _LOGGER.error("%s request to %s timed out", api_label, url)
-        raise Exception(f"{api_label} request timed out")
-    except aiohttp.ClientError as err:
-        _LOGGER.error("%s client error: %s", api_label, err)
-        raise Exception(f"{api_label} client error: {err}")
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (ValueError, TypeError, KeyError):
+        return None
+
+
+def token_expires_at(token, auth_data=None) -> float:
+    """Return when ``token`` expires, or 0 when that is unknown.
+
+    An ``expires_in``/``expiresIn`` lifetime in the auth response wins over
+    the token's own ``exp`` claim.
+    """
+    if isinstance(auth_data, dict):
+        for key in ("expires_in", "expiresIn"):
+            expires_in = auth_data.get(key)
+            if isinstance(expires_in, (int, float)) or (
+                isinstance(expires_in, str) and expires_in.isdigit()
+            ):
+                return time.time() + int(expires_in)
+    return jwt_expiry(token) or 0
 
 
 def normalize_phone(phone: str) -> str:
@@ -1,5 +1,16 @@
 import aiohttp
-from .api_helpers import normalize_phone, request_json
+import logging
+import time
+
+from .api_helpers import (
+    ResponseCache,
+    SingleFlight,
+    normalize_phone,
+    request_json,
+    token_expires_at,
+)
+
+_LOGGER = logging.getLogger(__name__)
 
 
 class InPostApi:
@@ -9,12 +20,29 @@ class InPostApi:
         self._session = session
         self._token = None
         self._refresh_token = None
+        self._expires_at = 0
+        self._refresh_flight = SingleFlight()
         self._device_uid = device_uid
+        self.response_cache = ResponseCache()
+        # Whether the last parcel list request was answered with a 304.
+        self.list_unchanged = False
 
-    async def request(self, method, path, data=None, headers=None):
+    async def request(self, method, path, data=None, headers=None, cache=None, ensure_token=True):
         if headers is None:
             headers = {}
 
+        # Refresh the token shortly before it expires instead of after a 401
+        if (
+            ensure_token
+            and self._refresh_token
+            and self._expires_at
+            and time.time() > self._expires_at - 60
+        ):
+            try:
+                await self.refresh_token()
+            except Exception as err:
+                _LOGGER.warning("Early InPost token refresh failed: %s", err)
+
         url = f"{self.BASE_URL}/{path.lstrip('/')}"
         default_headers = {
             "Content-Type": "application/json",
@@ -38,6 +66,7 @@ class InPostApi:
             label="InPost",
             log_401_as_info=True,
             error_with_text=True,
+            cache=cache,
         )
 
     async def send_sms_code(self, phone_number):
@@ -63,10 +92,14 @@ class InPostApi:
         data = await self.request("POST", "/v1/account/verification", payload)
         self._token = data.get("authToken")
         self._refresh_token = data.get("refreshToken")
+        self._expires_at = token_expires_at(self._token, data)
         return data
 
     async def refresh_token(self):
-        """Refresh the InPost token."""
+        """Refresh the InPost token; concurrent callers share one refresh."""
+        return await self._refresh_flight.run(self._refresh_token_once)
+
+    async def _refresh_token_once(self):
         if not self._refresh_token:
             raise Exception("Missing InPost refresh token")
 
@@ -75,15 +108,20 @@ class InPostApi:
             "phoneOS": "Android",
         }
 
-        data = await self.request("POST", "v1/authenticate", payload)
+        data = await self.request("POST", "v1/authenticate", payload, ensure_token=False)
 
         new_auth = data.get("authToken")
         if new_auth:
             self._token = new_auth
+            self._expires_at = token_expires_at(new_auth, data)
             if data.get("refreshToken"):
                 self._refresh_token = data.get("refreshToken")
 
         return data
 
     async def get_parcels(self):
-        return await self.request("GET", "v4/parcels/tracked")
+        self.list_unchanged = False
+        hits = self.response_cache.hits
+        data = await self.request("GET", "v4/parcels/tracked", cache=self.response_cache)
+        self.list_unchanged = self.response_cache.hits > hits
+        return data
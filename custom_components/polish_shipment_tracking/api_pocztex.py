@@ -5,7 +5,7 @@ import secrets
 import time
 import urllib.parse
 
-from .api_helpers import request_json
+from .api_helpers import DetailCache, ResponseCache, SingleFlight, request_json
 
 """
 Authorization is basically:
@@ -36,6 +36,13 @@ class PocztexApi:
         self._refresh_token = None
         self._expires_at = 0
         self._refresh_expires_at = 0
+        self._refresh_flight = SingleFlight()
+        self.response_cache = ResponseCache()
+        # Whether the last parcel list request was answered with a 304.
+        self.list_unchanged = False
+        # Kept apart so detail requests cannot evict the parcel list.
+        self.details_response_cache = ResponseCache(max_entries=256)
+        self.detail_cache = DetailCache()
 
     def _token_url(self):
         base = self.AUTH_BASE_URL.rstrip("/")
@@ -196,6 +203,10 @@ class PocztexApi:
         return token_data
 
     async def refresh_token(self):
+        """Refresh the access token; concurrent callers share one refresh."""
+        return await self._refresh_flight.run(self._refresh_token_once)
+
+    async def _refresh_token_once(self):
         if not self._refresh_token:
             raise Exception("Missing Pocztex refresh token")
         if self._refresh_expires_at and time.time() > self._refresh_expires_at:
@@ -217,7 +228,7 @@ class PocztexApi:
         self._save_token_data(token_data)
         return token_data
 
-    async def request(self, method, path, params=None):
+    async def request(self, method, path, params=None, cache=None):
         # Refresh token if about to expire
         if self._token and self._expires_at and time.time() > self._expires_at - 60:
             await self.refresh_token()
@@ -245,13 +256,18 @@ class PocztexApi:
             label="Pocztex",
             log_401_as_info=False,
             error_with_text=True,
+            cache=cache,
         )
 
     async def get_parcels(self):
-        return await self.request("GET", "/tracking")
+        self.list_unchanged = False
+        hits = self.response_cache.hits
+        data = await self.request("GET", "/tracking", cache=self.response_cache)
+        self.list_unchanged = self.response_cache.hits > hits
+        return data
 
     async def get_parcel_details(self, tracking_id):
         if tracking_id is None:
             raise Exception("Missing Pocztex tracking id")
         path = f"/tracking/{urllib.parse.quote(str(tracking_id))}/details"
-        return await self.request("GET", path)
+        return await self.request("GET", path, cache=self.details_response_cache)
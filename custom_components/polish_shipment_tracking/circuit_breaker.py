@@ -0,0 +1,98 @@
+"""Per-courier circuit breaker for Polish Shipment Tracking."""
+from __future__ import annotations
+
+import logging
+import random
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# Consecutive hard failures before the breaker opens.
+FAILURE_THRESHOLD = 3
+BASE_BACKOFF = 60.0
+MAX_BACKOFF = 3600.0
+BACKOFF_JITTER = 0.2
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+
+
+class CircuitBreaker:
+    """Stops calling a courier API that keeps failing hard.
+
+    Only retryable failures (5xx, timeouts, connection errors, throttling)
+    count; they say nothing about a single account. After
+    ``FAILURE_THRESHOLD`` of them in a row the breaker opens and refuses
+    calls until the backoff elapses. Then one probe call is let through
+    (half open): success closes the breaker, failure reopens it with the
+    backoff doubled.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._opened = 0
+        self._retry_at = 0.0
+
+    def allow(self) -> bool:
+        """Return whether a call may go out now."""
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_OPEN and time.monotonic() >= self._retry_at:
+            self.state = STATE_HALF_OPEN
+            _LOGGER.debug("%s circuit half open, probing", self.name)
+            return True
+        return False
+
+    def retry_in(self) -> float:
+        """Seconds until the breaker lets a call through again."""
+        if self.state == STATE_CLOSED:
+            return 0.0
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def record_success(self) -> None:
+        if self.state != STATE_CLOSED:
+            _LOGGER.info("%s API recovered, circuit closed", self.name)
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self._opened = 0
+
+    def record_failure(self, retry_after: float | None = None) -> None:
+        self.failures += 1
+        if self.state == STATE_CLOSED and self.failures < FAILURE_THRESHOLD:
+            return
+        backoff = min(BASE_BACKOFF * 2**self._opened, MAX_BACKOFF)
+        backoff *= 1 + random.uniform(-BACKOFF_JITTER, BACKOFF_JITTER)
+        if retry_after:
+            backoff = max(backoff, retry_after)
+        self._opened += 1
+        self._retry_at = time.monotonic() + backoff
+        if self.state != STATE_OPEN:
+            _LOGGER.warning(
+                "%s API failing, pausing requests for %.0fs", self.name, backoff
+            )
+        self.state = STATE_OPEN
+
+    def record_probe_skipped(self) -> None:
+        """Let the next call probe again when this probe was cancelled."""
+        if self.state == STATE_HALF_OPEN:
+            self.state = STATE_OPEN
+
+    def as_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "failures": self.failures,
+            "retry_in_seconds": round(self.retry_in()),
+        }
+
+
+def get_circuit_breaker(courier: str) -> CircuitBreaker:
+    """Return the breaker shared by every account of ``courier``."""
+    breaker = _BREAKERS.get(courier)
+    if breaker is None:
+        breaker = _BREAKERS[courier] = CircuitBreaker(courier)
+    return breaker
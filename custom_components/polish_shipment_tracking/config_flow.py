@@ -3,6 +3,7 @@ import uuid
 import json
 import logging
 from homeassistant import config_entries
+from homeassistant.core import callback
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
@@ -16,8 +17,13 @@ from .const import (
     CONF_TOKEN_EXPIRES_AT,
     CONF_REFRESH_EXPIRES_AT,
     CONF_DEVICE_UID,
+    CONF_RAW_RESPONSE_ON_DEMAND,
+    CONF_AGGREGATED_EVENTS,
+    CONF_DEDICATED_SESSION,
 )
 from .api_helpers import normalize_phone
+from .coordinator import AccountView
+from .http_session import async_get_cookieless_session
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +32,11 @@ COURIERS = ["inpost", "dpd", "dhl", "pocztex"]
 class ShipmentTrackingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return ShipmentTrackingOptionsFlow(config_entry)
+
     def __init__(self):
         self.courier = None
         self.phone = None
@@ -72,7 +83,7 @@ class ShipmentTrackingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
                 elif self.courier == "dhl":
                     from .api_dhl import DhlApi
-                    self.api_instance = DhlApi(session)
+                    self.api_instance = DhlApi(async_get_cookieless_session(self.hass))
                     await self.api_instance.generate_code(self.phone)
 
                 return await self.async_step_sms()
@@ -143,7 +154,8 @@ class ShipmentTrackingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     data = await api.confirm_sms_code(self.phone, code)
                     tokens = {
                         CONF_TOKEN: data.get("authToken"),
-                        CONF_REFRESH_TOKEN: data.get("refreshToken")
+                        CONF_REFRESH_TOKEN: data.get("refreshToken"),
+                        CONF_TOKEN_EXPIRES_AT: api._expires_at,
                     }
 
                 elif self.courier == "dpd":
@@ -157,15 +169,16 @@ class ShipmentTrackingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     }
                 
                 elif self.courier == "dhl":
-                    from .api_dhl import DhlApi
-                    api = DhlApi(session)
+                    # Same client as generate_code, so its cookies carry over.
+                    api = self.api_instance
                     data = await api.validate_code(self.phone, code, self.device_uid)
                     token = data.get("accessToken") or data.get("data", {}).get("accessToken")
                     
                     # Persist cookies so they survive restarts.
-                    cookies_json = json.dumps(api._cookies)
+                    cookies_json = json.dumps(api.export_cookies(), sort_keys=True)
                     tokens = {
                         CONF_TOKEN: token,
+                        CONF_TOKEN_EXPIRES_AT: api._expires_at,
                         "cookies": cookies_json
                     }
 
@@ -191,3 +204,39 @@ class ShipmentTrackingConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
             description_placeholders={"phone": self.phone}
         )
+
+
+class ShipmentTrackingOptionsFlow(config_entries.OptionsFlow):
+    def __init__(self, config_entry):
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input=None):
+        view = self.hass.data.get(DOMAIN, {}).get(self._entry.entry_id)
+        if isinstance(view, AccountView) and not view.is_primary:
+            # The options of the entry owning the shared coordinator apply.
+            return self.async_abort(
+                reason="shared_account",
+                description_placeholders={"primary": view.coordinator.entry.title},
+            )
+
+        if user_input is not None:
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        return self.async_show_form(
+            step_id="init",
+            data_schema=vol.Schema({
+                vol.Optional(
+                    CONF_RAW_RESPONSE_ON_DEMAND,
+                    default=options.get(CONF_RAW_RESPONSE_ON_DEMAND, False),
+                ): bool,
+                vol.Optional(
+                    CONF_AGGREGATED_EVENTS,
+                    default=options.get(CONF_AGGREGATED_EVENTS, False),
+                ): bool,
+                vol.Optional(
+                    CONF_DEDICATED_SESSION,
+                    default=options.get(CONF_DEDICATED_SESSION, False),
+                ): bool,
+            }),
+        )
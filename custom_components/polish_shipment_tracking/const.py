@@ -15,6 +15,13 @@ CONF_TOKEN_EXPIRES_AT = "token_expires_at"
 CONF_REFRESH_EXPIRES_AT = "refresh_expires_at"
 CONF_DEVICE_UID = "device_uid"
 
+SIGNAL_PARCELS_UPDATED = f"{DOMAIN}_parcels_updated"
+
+# --- Options ---
+CONF_RAW_RESPONSE_ON_DEMAND = "raw_response_on_demand"
+CONF_AGGREGATED_EVENTS = "aggregated_events"
+CONF_DEDICATED_SESSION = "dedicated_session"
+
 # --- Frontend registration constants ---
 _MANIFEST_PATH: Final[Path] = Path(__file__).parent / "manifest.json"
 
@@ -1,13 +1,18 @@
+from collections import Counter
 from datetime import timedelta
+from types import MappingProxyType
 import asyncio
 import logging
 import json
+import random
 import time
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 
 from .const import (
     DOMAIN,
@@ -17,29 +22,153 @@ from .const import (
     CONF_REFRESH_EXPIRES_AT,
     CONF_COURIER,
     CONF_DEVICE_UID,
+    CONF_EMAIL,
+    CONF_PHONE,
+    CONF_DEDICATED_SESSION,
+    CONF_RAW_RESPONSE_ON_DEMAND,
 )
+from .api_helpers import ApiAuthError, ApiError, normalize_phone, token_expires_at
+from .circuit_breaker import get_circuit_breaker
+from .credentials import async_get_credential_store
+from .http_session import (
+    PRECONNECT_LEAD,
+    async_acquire_session,
+    async_get_cookieless_session,
+    async_release_session,
+)
+from .helpers import is_delivered
+from .models import Parcel, build_parcels
+from .timeline import TimelineStore
 
 _LOGGER = logging.getLogger(__name__)
 
+# Polling interval per normalized status of an active parcel. The most
+# urgent (shortest) interval among all active parcels wins.
+STATUS_POLL_INTERVALS: dict[str, timedelta] = {
+    "handed_out_for_delivery": timedelta(minutes=5),
+    "exception": timedelta(minutes=10),
+    "unknown": timedelta(minutes=15),
+    "waiting_for_pickup": timedelta(minutes=30),
+    "in_transport": timedelta(minutes=30),
+    "created": timedelta(minutes=60),
+}
+DEFAULT_POLL_INTERVAL = timedelta(minutes=15)
+IDLE_POLL_INTERVAL = timedelta(hours=2)
+MIN_POLL_INTERVAL = timedelta(minutes=5)
+MAX_POLL_INTERVAL = timedelta(hours=3)
+# First retry delay after a retryable failure; doubles per failure and is
+# capped by the regular status-based interval.
+RETRY_BACKOFF = timedelta(minutes=1)
+# Each scheduled interval is spread by up to +/- this fraction so entries
+# set up together do not keep hitting the courier APIs at the same moment.
+POLL_JITTER = 0.1
+
+# Last successful parcel set, restored at startup before the first poll.
+# Snapshots written with another schema version are discarded, not migrated.
+SNAPSHOT_VERSION = 1
+SNAPSHOT_MAX_AGE = timedelta(hours=24)
+SNAPSHOT_SAVE_DELAY = 10  # seconds
+# Unchanged parcels are written again once the snapshot is this old, so it
+# stays restorable.
+SNAPSHOT_RESAVE_AGE = SNAPSHOT_MAX_AGE / 2
+
+
+def compute_poll_interval(active_counts: Counter[str]) -> tuple[timedelta, str]:
+    """Return the polling interval for the given active statuses and its reason.
+
+    The reason is the status that decided the interval, or ``idle`` when
+    there is nothing active.
+    """
+    if not active_counts:
+        interval, reason = IDLE_POLL_INTERVAL, "idle"
+    else:
+        interval, reason = min(
+            (STATUS_POLL_INTERVALS.get(status_key, DEFAULT_POLL_INTERVAL), status_key)
+            for status_key in active_counts
+        )
+    return max(MIN_POLL_INTERVAL, min(interval, MAX_POLL_INTERVAL)), reason
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the storage helper holding an entry's parcel snapshot."""
+    return Store(hass, SNAPSHOT_VERSION, f"{DOMAIN}.{entry_id}.parcels")
+
+
+def account_key(entry: ConfigEntry) -> tuple[str, str] | None:
+    """Return (courier, normalized account id) identifying the polled account."""
+    data = entry.data
+    if data.get(CONF_PHONE):
+        return data[CONF_COURIER], normalize_phone(data[CONF_PHONE])
+    if data.get(CONF_EMAIL):
+        return data[CONF_COURIER], str(data[CONF_EMAIL]).strip().lower()
+    return None
+
+
+def _pocztex_detail_fingerprint(parcel: dict) -> tuple:
+    """Fields of a Pocztex list entry that change whenever its details do."""
+    return tuple(
+        repr(parcel.get(key)) for key in ("stateDate", "state", "status", "stateCode")
+    )
+
+
 class ShipmentCoordinator(DataUpdateCoordinator):
     """Class to manage fetching shipment data."""
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry):
         """Initialize the coordinator."""
         self.entry = entry
+        # Config entries sharing this account; the first one owns the entities.
+        self.entries: list[ConfigEntry] = [entry]
         self.courier = entry.data[CONF_COURIER]
         self.known_parcels = set()
+        self.parcels_by_id: dict[str, Parcel] = {}
+        self.previous_parcels_by_id: dict[str, Parcel] = {}
+        self.active_counts: Counter[str] = Counter()
+        # Active (non-terminal) parcels that appeared or disappeared with the
+        # latest parcel list, and previously active parcels whose content
+        # changed, including those that just became terminal.
+        self.added_ids: set[str] = set()
+        self.removed_ids: set[str] = set()
+        self.changed_ids: set[str] = set()
+        self._active_fingerprints: dict[str, str] = {}
         self.add_entities_callback = None
+        # Interval chosen from the active statuses, before jitter.
+        self.poll_interval = DEFAULT_POLL_INTERVAL
+        self.poll_reason = "startup"
+        self.circuit_breaker = get_circuit_breaker(self.courier)
+        self._failures = 0
         
         super().__init__(
             hass,
             _LOGGER,
             name=f"Shipment Tracking {self.courier}",
-            update_interval=timedelta(minutes=15),
+            update_interval=DEFAULT_POLL_INTERVAL,
+            # Unchanged refreshes return the same list object, which then
+            # skips the listener fan-out entirely.
+            always_update=False,
         )
         
-        self.session = async_get_clientsession(hass)
+        # Opt-in session owned by the integration instead of Home
+        # Assistant's shared one.
+        self._courier_session = None
+        self._cancel_preconnect = None
+        if entry.options.get(CONF_DEDICATED_SESSION, False):
+            self._courier_session = async_acquire_session(hass, self.courier)
+            self.session = self._courier_session.session
+        elif self.courier == "dhl":
+            # DhlApi keeps its cookies per account.
+            self.session = async_get_cookieless_session(hass)
+        else:
+            self.session = async_get_clientsession(hass)
+        # Sensors only write their state when the parcel changed, so this
+        # is fixed per coordinator; changing the option reloads the entry.
+        self.raw_response_on_demand = entry.options.get(CONF_RAW_RESPONSE_ON_DEMAND, False)
         self.api = self._get_api_instance()
+        self._snapshot_store = snapshot_store(hass, entry.entry_id)
+        # Parcel fingerprints and time of the last snapshot written or loaded.
+        self._saved_fingerprints: dict[str, str] | None = None
+        self._saved_at = 0.0
+        self.timeline = TimelineStore(hass, entry.entry_id)
 
     def _get_api_instance(self):
         """Get API instance based on courier."""
@@ -53,6 +182,7 @@ class ShipmentCoordinator(DataUpdateCoordinator):
             api = InPostApi(self.session, device_uid=device_uid)
             api._token = token
             api._refresh_token = refresh_token
+            api._expires_at = data.get(CONF_TOKEN_EXPIRES_AT) or token_expires_at(token)
             return api
             
         elif self.courier == "dpd":
@@ -67,11 +197,12 @@ class ShipmentCoordinator(DataUpdateCoordinator):
             from .api_dhl import DhlApi
             api = DhlApi(self.session, device_id=device_uid)
             api._token = token
+            api._expires_at = data.get(CONF_TOKEN_EXPIRES_AT) or token_expires_at(token)
             
             cookies_json = data.get("cookies")
             if cookies_json:
                 try:
-                    api._cookies = json.loads(cookies_json)
+                    api.restore_cookies(json.loads(cookies_json))
                 except Exception as e:
                     _LOGGER.warning("Failed to restore DHL cookies: %s", e)
             
@@ -89,31 +220,255 @@ class ShipmentCoordinator(DataUpdateCoordinator):
 
     async def _async_update_data(self):
         """Fetch data from API."""
+        breaker = self.circuit_breaker
+        if not breaker.allow():
+            retry_in = max(breaker.retry_in(), RETRY_BACKOFF.total_seconds())
+            self._schedule_retry(timedelta(seconds=retry_in), "circuit_open")
+            raise UpdateFailed(
+                f"{self.courier} API is failing, next attempt in {retry_in:.0f}s"
+            )
         try:
-            return await self._fetch_parcels_with_retry()
+            items = await self._fetch_parcels_with_retry()
+        except asyncio.CancelledError:
+            breaker.record_probe_skipped()
+            raise
         except Exception as err:
+            if isinstance(err, ApiError) and err.retryable:
+                breaker.record_failure(err.retry_after)
+                self._schedule_backoff(err.retry_after)
+            else:
+                # The API answered; whatever went wrong is not an outage.
+                breaker.record_success()
+                self._failures = 0
+                self._schedule_next_poll()
             _LOGGER.error("Error fetching data for %s: %s", self.courier, err)
             raise UpdateFailed(f"Error communicating with API: {err}")
+        breaker.record_success()
+        self._failures = 0
+        # The client may have refreshed its token ahead of expiry or received
+        # new cookies; only actual changes reach the config entries.
+        self._save_tokens()
+        if items is None:
+            # The courier answered 304 Not Modified: keep the current records.
+            self._schedule_next_poll()
+            if self.data is not None:
+                self._save_snapshot(self.data)
+            return self.data
+        parcels = self._set_parcels(build_parcels(items, self.courier))
+        self._schedule_next_poll()
+        self._save_snapshot(parcels)
+        return parcels
+
+    def _save_snapshot(self, parcels: list[Parcel], force: bool = False) -> None:
+        """Queue a snapshot write unless the saved one holds the same parcels."""
+        fingerprints = {parcel.parcel_id: parcel.fingerprint for parcel in parcels}
+        now = time.time()
+        if (
+            not force
+            and fingerprints == self._saved_fingerprints
+            and now - self._saved_at < SNAPSHOT_RESAVE_AGE.total_seconds()
+        ):
+            return
+        self._saved_fingerprints = fingerprints
+        self._saved_at = now
+        self._snapshot_store.async_delay_save(
+            lambda: self._snapshot_data(parcels), SNAPSHOT_SAVE_DELAY
+        )
+
+    @staticmethod
+    def _snapshot_data(parcels: list[Parcel]) -> dict:
+        return {
+            "saved_at": time.time(),
+            "parcels": [parcel.as_dict() for parcel in parcels],
+        }
+
+    async def async_load_snapshot(self) -> bool:
+        """Publish the stored parcel set, if it is recent enough.
+
+        Returns whether a snapshot was used; the caller still has to refresh.
+        """
+        try:
+            snapshot = await self._snapshot_store.async_load()
+        except NotImplementedError:
+            _LOGGER.debug("Discarding %s snapshot from another schema version", self.courier)
+            return False
+        except Exception as err:
+            _LOGGER.warning("Failed to load %s parcel snapshot: %s", self.courier, err)
+            return False
+        if not snapshot:
+            return False
+        age = time.time() - snapshot.get("saved_at", 0)
+        if not 0 <= age <= SNAPSHOT_MAX_AGE.total_seconds():
+            return False
+        try:
+            parcels = [Parcel.from_dict(data) for data in snapshot["parcels"]]
+        except (KeyError, TypeError) as err:
+            _LOGGER.warning("Ignoring malformed %s parcel snapshot: %s", self.courier, err)
+            return False
+        self._set_parcels(parcels)
+        self._saved_fingerprints = {parcel.parcel_id: parcel.fingerprint for parcel in parcels}
+        self._saved_at = snapshot.get("saved_at", 0)
+        self._schedule_next_poll()
+        self.async_set_updated_data(parcels)
+        _LOGGER.debug(
+            "Restored %d %s parcels from a %.0fs old snapshot", len(parcels), self.courier, age
+        )
+        return True
+
+    def _schedule_next_poll(self) -> None:
+        """Pick the next update interval from the active parcels' statuses."""
+        interval, reason = compute_poll_interval(self.active_counts)
+        if (interval, reason) != (self.poll_interval, self.poll_reason):
+            _LOGGER.debug(
+                "%s polling every %s (%s)", self.courier, interval, reason
+            )
+        self.poll_interval = interval
+        self.poll_reason = reason
+        jitter = random.uniform(-POLL_JITTER, POLL_JITTER)
+        self.update_interval = max(
+            MIN_POLL_INTERVAL, min(interval * (1 + jitter), MAX_POLL_INTERVAL)
+        )
+        self._schedule_preconnect()
+
+    def _schedule_backoff(self, retry_after: float | None) -> None:
+        """Retry sooner than the regular interval, backing off exponentially."""
+        self._failures += 1
+        regular, _ = compute_poll_interval(self.active_counts)
+        delay = min(RETRY_BACKOFF * 2 ** (self._failures - 1), regular)
+        delay *= 1 + random.uniform(-POLL_JITTER, POLL_JITTER)
+        if retry_after:
+            delay = max(delay, timedelta(seconds=retry_after))
+        reason = "backoff"
+        if self.circuit_breaker.retry_in():
+            delay = max(delay, timedelta(seconds=self.circuit_breaker.retry_in()))
+            reason = "circuit_open"
+        self._schedule_retry(delay, reason)
+
+    def _schedule_retry(self, delay: timedelta, reason: str) -> None:
+        self.poll_interval = delay
+        self.poll_reason = reason
+        self.update_interval = min(delay, MAX_POLL_INTERVAL)
+        self._schedule_preconnect()
+
+    @property
+    def uses_dedicated_session(self) -> bool:
+        return self._courier_session is not None
+
+    def _schedule_preconnect(self) -> None:
+        """Open the connection shortly before the next scheduled refresh."""
+        if self._courier_session is None:
+            return
+        if self._cancel_preconnect is not None:
+            self._cancel_preconnect()
+        self._cancel_preconnect = async_call_later(
+            self.hass,
+            max(0.0, self.update_interval.total_seconds() - PRECONNECT_LEAD),
+            self._async_preconnect,
+        )
+
+    @callback
+    def _async_preconnect(self, _now) -> None:
+        self._cancel_preconnect = None
+        self.entry.async_create_background_task(
+            self.hass,
+            self._courier_session.async_preconnect(),
+            f"{DOMAIN} pre-connect {self.courier}",
+        )
+
+    async def async_shutdown(self) -> None:
+        """Stop polling and close the dedicated session, if any."""
+        await super().async_shutdown()
+        if self._cancel_preconnect is not None:
+            self._cancel_preconnect()
+            self._cancel_preconnect = None
+        if self._courier_session is not None:
+            courier_session, self._courier_session = self._courier_session, None
+            await async_release_session(self.hass, courier_session)
+
+    def uses_options_of(self, entry: ConfigEntry) -> bool:
+        """Whether the options fixed at setup match those of ``entry``."""
+        options = entry.options
+        return (
+            options.get(CONF_DEDICATED_SESSION, False) == self.uses_dedicated_session
+            and options.get(CONF_RAW_RESPONSE_ON_DEMAND, False) == self.raw_response_on_demand
+        )
+
+    @callback
+    def hand_over(self, entry: ConfigEntry) -> None:
+        """Make ``entry`` the owner of the account, its entities and stores."""
+        self.entry = entry
+        self.config_entry = entry
+        # The stores of the previous owner go away when it is deleted.
+        self._snapshot_store = snapshot_store(self.hass, entry.entry_id)
+        if self.data is not None:
+            self._save_snapshot(self.data, force=True)
+        self.timeline.move_to(self.hass, entry.entry_id)
+
+    def _parcel_list_unchanged(self) -> bool:
+        """Whether the parcel list request was answered from the response cache."""
+        return self.data is not None and self.api.list_unchanged
+
+    def _set_parcels(self, parcels: list[Parcel]) -> list[Parcel]:
+        """Publish the tracking number index, active counts and change sets
+        for a new parcel list."""
+        index: dict[str, Parcel] = {}
+        for parcel in parcels:
+            index.setdefault(parcel.parcel_id, parcel)
+        # Kept for one refresh so listeners can report status transitions.
+        self.previous_parcels_by_id = self.parcels_by_id
+        self.parcels_by_id = index
+        self.active_counts = Counter(
+            parcel.status_key for parcel in index.values() if not parcel.terminal
+        )
+
+        previous = self._active_fingerprints
+        active = {
+            parcel_id: parcel.fingerprint
+            for parcel_id, parcel in index.items()
+            if not parcel.terminal
+        }
+        self.added_ids = active.keys() - previous.keys()
+        self.removed_ids = previous.keys() - active.keys()
+        # Taken over the previous active parcels so a delivered, returned or
+        # cancelled parcel still reports its last transition.
+        self.changed_ids = {
+            parcel_id
+            for parcel_id, fingerprint in previous.items()
+            if parcel_id in index and index[parcel_id].fingerprint != fingerprint
+        }
+        self._active_fingerprints = active
+        self.timeline.record(parcels)
+        return parcels
+
+    @property
+    def active_ids(self):
+        """Tracking numbers of the active parcels."""
+        return self._active_fingerprints.keys()
 
     async def _fetch_parcels_with_retry(self):
         """Fetch parcels and retry once if unauthorized."""
         try:
             return await self._fetch_parcels()
-        except Exception as e:
-            if "401" in str(e) or "unauthorized" in str(e).lower():
-                _LOGGER.info("%s token expired, refreshing...", self.courier)
-                await self._refresh_token()
-                return await self._fetch_parcels()
-            raise e
+        except ApiAuthError:
+            _LOGGER.info("%s token expired, refreshing...", self.courier)
+            await self._refresh_token()
+            return await self._fetch_parcels()
 
     async def _fetch_parcels(self):
-        """Fetch parcels from API without retry logic."""
+        """Fetch parcels from API without retry logic.
+
+        Returns None when the parcel list is unchanged since the last refresh.
+        """
         if self.courier == "inpost":
             data = await self.api.get_parcels()
+            if self._parcel_list_unchanged():
+                return None
             return data if isinstance(data, list) else data.get("parcels", [])
             
         elif self.courier == "dpd":
             data = await self.api.get_parcels()
+            if self._parcel_list_unchanged():
+                return None
             if isinstance(data, list): return data
             if "packages" in data: return data["packages"]
             if "parcelList" in data: return data["parcelList"]
@@ -121,11 +476,15 @@ class ShipmentCoordinator(DataUpdateCoordinator):
             return []
             
         elif self.courier == "dhl":
-            data = await self.api.get_parcels()
-            return data.get("shipments", [])
+            items = [shipment async for shipment in self.api.iter_parcels()]
+            if self._parcel_list_unchanged():
+                return None
+            return items
 
         elif self.courier == "pocztex":
             data = await self.api.get_parcels()
+            if self._parcel_list_unchanged():
+                return None
             parcels = []
             if isinstance(data, list):
                 parcels = data
@@ -137,9 +496,13 @@ class ShipmentCoordinator(DataUpdateCoordinator):
             if not parcels:
                 return []
 
-            # Pocztex needs separate calls for details
-            detail_tasks = []
-            for parcel in parcels:
+            # Pocztex needs separate calls for details; reuse cached ones
+            # while the list entry is unchanged.
+            cache = self.api.detail_cache
+            details_results = [None] * len(parcels)
+            to_fetch = []
+            listed_ids = set()
+            for index, parcel in enumerate(parcels):
                 detail_id = None
                 if isinstance(parcel, dict):
                     detail_id = (
@@ -148,11 +511,45 @@ class ShipmentCoordinator(DataUpdateCoordinator):
                         or parcel.get("trackingID")
                     )
                 if detail_id is None:
-                    detail_tasks.append(asyncio.sleep(0, result=None))
+                    continue
+                listed_ids.add(detail_id)
+                fingerprint = _pocztex_detail_fingerprint(parcel)
+                hit, details = cache.get(detail_id, fingerprint)
+                if hit:
+                    details_results[index] = details
                 else:
-                    detail_tasks.append(self.api.get_parcel_details(detail_id))
+                    to_fetch.append((index, detail_id, fingerprint))
+
+            fetched = await asyncio.gather(
+                *(self.api.get_parcel_details(detail_id) for _, detail_id, _ in to_fetch),
+                return_exceptions=True,
+            )
+            error = None
+            for (index, detail_id, fingerprint), details in zip(to_fetch, fetched):
+                if isinstance(details, BaseException):
+                    # Only outages and missing parcels are worth backing off
+                    # per parcel; the rest fails the refresh, an auth error
+                    # first so the token gets refreshed.
+                    if isinstance(details, ApiError) and (
+                        details.retryable or details.status == 404
+                    ):
+                        cache.store_failure(detail_id, fingerprint)
+                    elif error is None or (
+                        isinstance(details, ApiAuthError)
+                        and not isinstance(error, ApiAuthError)
+                    ):
+                        error = details
+                    continue
+                if details is None:
+                    cache.store_failure(detail_id, fingerprint)
+                    continue
+                merged = {**parcels[index], **details} if isinstance(details, dict) else parcels[index]
+                cache.store(detail_id, fingerprint, details, terminal=is_delivered(merged, "pocztex"))
+                details_results[index] = details
+            if error is not None:
+                raise error
+            cache.retain(listed_ids)
 
-            details_results = await asyncio.gather(*detail_tasks, return_exceptions=True)
             enriched = []
             for parcel, details in zip(parcels, details_results):
                 if isinstance(details, Exception) or details is None:
@@ -173,32 +570,36 @@ class ShipmentCoordinator(DataUpdateCoordinator):
 
     async def _refresh_token(self):
         """Refresh API token and update config entry."""
-        if self.courier == "inpost":
+        if self.courier == "dpd":
+            await self.api.refresh_access_token()
+        elif self.courier in ("inpost", "dhl", "pocztex"):
             await self.api.refresh_token()
-            new_data = {
-                **self.entry.data,
+        else:
+            return
+        self._save_tokens()
+
+    def _save_tokens(self):
+        """Queue the client's current tokens for every entry of the account."""
+        if self.courier == "inpost":
+            tokens = {
                 CONF_TOKEN: self.api._token,
                 CONF_REFRESH_TOKEN: self.api._refresh_token,
+                CONF_TOKEN_EXPIRES_AT: self.api._expires_at,
             }
         elif self.courier == "dpd":
-            await self.api.refresh_access_token()
-            new_data = {
-                **self.entry.data,
+            tokens = {
                 CONF_TOKEN: self.api._token,
                 CONF_REFRESH_TOKEN: self.api._refresh_token,
                 CONF_TOKEN_EXPIRES_AT: self.api._expires_at,
             }
         elif self.courier == "dhl":
-            await self.api.refresh_token()
-            new_data = {
-                **self.entry.data,
+            tokens = {
                 CONF_TOKEN: self.api._token,
-                "cookies": json.dumps(self.api._cookies),
+                CONF_TOKEN_EXPIRES_AT: self.api._expires_at,
+                "cookies": json.dumps(self.api.export_cookies(), sort_keys=True),
             }
         elif self.courier == "pocztex":
-            await self.api.refresh_token()
-            new_data = {
-                **self.entry.data,
+            tokens = {
                 CONF_TOKEN: self.api._token,
                 CONF_REFRESH_TOKEN: self.api._refresh_token,
                 CONF_TOKEN_EXPIRES_AT: self.api._expires_at,
@@ -207,4 +608,50 @@ class ShipmentCoordinator(DataUpdateCoordinator):
         else:
             return
 
-        self.hass.config_entries.async_update_entry(self.entry, data=new_data)
+        if not tokens[CONF_TOKEN]:
+            return
+        store = async_get_credential_store(self.hass)
+        for entry in self.entries:
+            store.async_update(entry, tokens)
+
+
+class AccountView:
+    """Read-only, per config entry view of a possibly shared coordinator.
+
+    Entries that point at the same courier account share one
+    ShipmentCoordinator. Each keeps its own view in ``hass.data`` so lookups
+    by entry still work; only the primary entry creates entities.
+    """
+
+    def __init__(self, coordinator: ShipmentCoordinator, entry: ConfigEntry) -> None:
+        self.coordinator = coordinator
+        self.entry = entry
+
+    @property
+    def courier(self) -> str:
+        return self.coordinator.courier
+
+    @property
+    def is_primary(self) -> bool:
+        return self.coordinator.entry is self.entry
+
+    @property
+    def parcels_by_id(self) -> MappingProxyType:
+        return MappingProxyType(self.coordinator.parcels_by_id)
+
+    @property
+    def parcels(self) -> tuple[Parcel, ...]:
+        return tuple(self.coordinator.data or ())
+
+    def async_add_listener(self, update_callback):
+        return self.coordinator.async_add_listener(update_callback)
+
+@callback
+def async_get_coordinators(hass: HomeAssistant) -> list[ShipmentCoordinator]:
+    """Return the coordinators of all loaded config entries, once per account."""
+    coordinators = {
+        id(value.coordinator): value.coordinator
+        for value in hass.data.get(DOMAIN, {}).values()
+        if isinstance(value, AccountView)
+    }
+    return list(coordinators.values())
@@ -0,0 +1,82 @@
+"""Batched credential persistence for Polish Shipment Tracking."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Token refreshes of every account within this window share one write.
+CREDENTIALS_SAVE_DELAY = 10  # seconds
+
+
+class CredentialStore:
+    """Collects token changes and writes them to the config entries in batches.
+
+    Every ``async_update_entry`` rewrites ``core.config_entries`` for the
+    whole instance, so values equal to what the entry already holds are
+    dropped and the rest is merged per entry until the delay expires.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._cancel_flush = None
+
+    @callback
+    def async_update(self, entry: ConfigEntry, values: dict[str, Any]) -> bool:
+        """Queue the changed ``values`` of ``entry``; return whether any changed."""
+        pending = self._pending.get(entry.entry_id, {})
+        changes = {
+            key: value
+            for key, value in values.items()
+            if pending.get(key, entry.data.get(key)) != value
+        }
+        if not changes:
+            return False
+        self._pending.setdefault(entry.entry_id, {}).update(changes)
+        if self._cancel_flush is None:
+            self._cancel_flush = async_call_later(
+                self.hass, CREDENTIALS_SAVE_DELAY, self._async_scheduled_flush
+            )
+        return True
+
+    @callback
+    def _async_scheduled_flush(self, _now) -> None:
+        self._cancel_flush = None
+        self.async_flush()
+
+    @callback
+    def async_flush(self, entry_id: str | None = None) -> None:
+        """Write the queued changes of one entry, or of all of them, now."""
+        entry_ids = list(self._pending) if entry_id is None else [entry_id]
+        for pending_id in entry_ids:
+            changes = self._pending.pop(pending_id, None)
+            if not changes:
+                continue
+            entry = self.hass.config_entries.async_get_entry(pending_id)
+            if entry is None:
+                continue
+            _LOGGER.debug("Saving %s for %s", ", ".join(sorted(changes)), entry.title)
+            self.hass.config_entries.async_update_entry(
+                entry, data={**entry.data, **changes}
+            )
+        if not self._pending and self._cancel_flush is not None:
+            self._cancel_flush()
+            self._cancel_flush = None
+
+
+@callback
+def async_get_credential_store(hass: HomeAssistant) -> CredentialStore:
+    """Return the store shared by every entry of the integration."""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    store = domain_data.get("_credentials")
+    if store is None:
+        store = domain_data["_credentials"] = CredentialStore(hass)
+    return store
@@ -191,12 +191,75 @@ class ShipmentTrackingCard extends HTMLElement {
       this.titleElement = this.querySelector("#card-title");
     }
     this._updateTitle();
-    this.updateContent();
+    this._subscribe();
+
+    // State changes elsewhere in Home Assistant do not affect this card;
+    // only re-render when the language (and so every label) changed.
+    const language = hass?.language;
+    if (this._renderedLanguage !== undefined && this._renderedLanguage !== language) {
+      this.updateContent();
+    }
   }
 
   setConfig(config) {
+    const previous = this.config;
     this.config = { ...(config || {}) };
     this._updateTitle();
+    if (previous && this._subscriptionKey(previous) !== this._subscriptionKey(this.config)) {
+      this._unsubscribe();
+      this._subscribe();
+    }
+  }
+
+  connectedCallback() {
+    this._subscribe();
+  }
+
+  disconnectedCallback() {
+    this._unsubscribe();
+  }
+
+  _subscriptionKey(config) {
+    return JSON.stringify([config?.courier, config?.account, config?.status, config?.sort]);
+  }
+
+  _subscribe() {
+    if (this._unsubscribePromise || !this._hass?.connection || !this.content) return;
+
+    const message = { type: "polish_shipment_tracking/subscribe" };
+    for (const key of ["courier", "account", "status", "sort"]) {
+      if (this.config?.[key]) message[key] = this.config[key];
+    }
+
+    this._shipments = new Map();
+    this._order = [];
+    this._unsubscribePromise = this._hass.connection
+      .subscribeMessage((delta) => this._handleDelta(delta), message)
+      .catch((err) => {
+        console.error("Shipment Tracking Card: subscription failed", err);
+        this._unsubscribePromise = undefined;
+      });
+  }
+
+  _unsubscribe() {
+    const promise = this._unsubscribePromise;
+    this._unsubscribePromise = undefined;
+    if (promise) {
+      promise.then((unsub) => unsub && unsub()).catch(() => {});
+    }
+  }
+
+  _handleDelta(delta) {
+    for (const key of delta.removed || []) {
+      this._shipments.delete(key);
+    }
+    for (const shipment of [...(delta.added || []), ...(delta.changed || [])]) {
+      this._shipments.set(shipment.key, shipment);
+    }
+    if (delta.order) {
+      this._order = delta.order;
+    }
+    this.updateContent();
   }
 
   static getStubConfig() {
@@ -221,11 +284,9 @@ class ShipmentTrackingCard extends HTMLElement {
     this.titleElement.innerText = title;
   }
 
-  getStatusInfo(stateObj) {
-    const attributes = stateObj?.attributes || {};
-    const statusKey = (attributes.status_key || '').toString().toLowerCase();
-    const raw = (attributes.status_raw || '').toString();
-    const state = (stateObj?.state || '').toString();
+  getStatusInfo(shipment) {
+    const statusKey = (shipment.status_key || '').toString().toLowerCase();
+    const raw = (shipment.status_raw || '').toString();
 
     const classMap = {
       delivered: 'status-delivered',
@@ -241,10 +302,8 @@ class ShipmentTrackingCard extends HTMLElement {
 
     const badgeClass = classMap[statusKey] || 'status-pending';
 
-    let label = state || raw || statusKey || '';
-    if (this._hass?.formatEntityState && stateObj) {
-      label = this._hass.formatEntityState(stateObj);
-    } else if (this._hass?.localize && statusKey) {
+    let label = raw || statusKey;
+    if (this._hass?.localize && statusKey) {
       const key = `component.polish_shipment_tracking.entity.sensor.shipment_status.state.${statusKey}`;
       const localized = this._hass.localize(key);
       if (localized && localized !== key) {
@@ -283,121 +342,72 @@ class ShipmentTrackingCard extends HTMLElement {
   }
 
   updateContent() {
-    if (!this.content || !this._hass) return;
-
-    const entitiesToShow = Object.keys(this._hass.states).filter((entityId) => {
-      if (!entityId.startsWith("sensor.")) return false;
-      const stateObj = this._hass.states[entityId];
-      return stateObj?.attributes?.integration_domain === "polish_shipment_tracking";
-    });
-
-    entitiesToShow.sort((a, b) => {
-        const keyA = (this._hass.states[a]?.attributes?.status_key || '').toString().toLowerCase();
-        const keyB = (this._hass.states[b]?.attributes?.status_key || '').toString().toLowerCase();
-        const score = (s) => {
-            if (s === 'waiting_for_pickup') return 0;
-            if (s === 'handed_out_for_delivery' || s === 'in_transport') return 1;
-            return 2;
-        };
-        return score(keyA) - score(keyB);
-    });
-
-    const signatureParts = [];
-    entitiesToShow.forEach(entityId => {
-      const stateObj = this._hass.states[entityId];
-      if (!stateObj) return;
-        const attrs = stateObj.attributes || {};
-        signatureParts.push([
-          entityId,
-          stateObj.state || '',
-          attrs.status_key || '',
-          attrs.status_raw || '',
-          attrs.sender || '',
-          attrs.sender_name || '',
-          attrs.recipient_name || '',
-          attrs.tracking_number || '',
-          attrs.courier || '',
-          attrs.location || '',
-          attrs.current_location || '',
-          attrs.open_code || '',
-        attrs.pickup_code || ''
-      ].join('|'));
-    });
-
-    const signature = signatureParts.join('||');
-    if (this._lastSignature === signature) {
-      return;
-    }
-    this._lastSignature = signature;
+    if (!this.content || !this._hass || !this._shipments) return;
+    this._renderedLanguage = this._hass.language;
 
     let html = '';
     const pickupCodeLabel = this._localize("labels.pickup_code");
     const pickupPointLabel = this._localize("labels.pickup_point");
     const defaultCourier = this._localize("labels.courier_default");
 
-    entitiesToShow.forEach(entityId => {
-      const stateObj = this._hass.states[entityId];
-
-      if (stateObj) {
-        const state = stateObj.state;
-        if (state === 'unavailable') return;
-
-        const attributes = stateObj.attributes;
-        const friendlyName = attributes.sender || attributes.sender_name || attributes.recipient_name || attributes.tracking_number;
-        const courier = attributes.courier || attributes.attribution || (entityId.includes('inpost') ? 'InPost' : defaultCourier);
-        const line2 = friendlyName === attributes.tracking_number ? "" : attributes.tracking_number;
-
-        const imageUrl = this.getCourierImage(courier);
-        const iconMdi = attributes.icon || this.getCourierIcon(courier);
-
-        let iconHtml;
-        if (imageUrl) {
-          iconHtml = `<img src="${imageUrl}" alt="${courier}" class="courier-logo" onerror="this.style.display='none'; this.nextElementSibling.style.display='block';">
-                      <ha-icon icon="${iconMdi}" style="display:none;"></ha-icon>`;
-        } else {
-          iconHtml = `<ha-icon icon="${iconMdi}"></ha-icon>`;
-        }
-
-        const statusInfo = this.getStatusInfo(stateObj);
-        const location = attributes.location || attributes.current_location || '';
-        const pickupCode = attributes.open_code || attributes.pickup_code || '';
-
-        let codeHtml = '';
-        if (pickupCode) {
-            codeHtml = `<span class="pickup-code">${pickupCodeLabel}: ${pickupCode}</span>`;
-        }
-
-        let detailsHtml = '';
-        if (location) {
-             detailsHtml = `<span>${pickupPointLabel}: ${location}</span>`;
-        }
-
-        html += `
-          <div class="shipment-item">
-            <div class="icon-container">
-              ${iconHtml}
-            </div>
+    this._order.forEach(key => {
+      const shipment = this._shipments.get(key);
+      if (!shipment) return;
 
-            <div class="content-right">
-                <div class="row-top">
-                    <div class="info-main">
-                        <div class="name">${friendlyName}</div>
-                        <div class="courier">${line2}</div>
-                    </div>
-                    <div class="status-badge ${statusInfo.class}">
-                        ${statusInfo.text}
-                    </div>
-                </div>
-
-                <div class="row-bottom">
-                    <div class="extra-info">
-                        ${codeHtml}${detailsHtml}
-                    </div>
-                </div>
-            </div>
-          </div>
-        `;
+      const friendlyName = shipment.sender || shipment.recipient_name || shipment.tracking_number;
+      const courier = shipment.courier || defaultCourier;
+      const line2 = friendlyName === shipment.tracking_number ? "" : shipment.tracking_number;
+
+      const imageUrl = this.getCourierImage(courier);
+      const iconMdi = this.getCourierIcon(courier);
+
+      let iconHtml;
+      if (imageUrl) {
+        iconHtml = `<img src="${imageUrl}" alt="${courier}" class="courier-logo" onerror="this.style.display='none'; this.nextElementSibling.style.display='block';">
+                    <ha-icon icon="${iconMdi}" style="display:none;"></ha-icon>`;
+      } else {
+        iconHtml = `<ha-icon icon="${iconMdi}"></ha-icon>`;
+      }
+
+      const statusInfo = this.getStatusInfo(shipment);
+      const location = shipment.location || '';
+      const pickupCode = shipment.pickup_code || '';
+
+      let codeHtml = '';
+      if (pickupCode) {
+          codeHtml = `<span class="pickup-code">${pickupCodeLabel}: ${pickupCode}</span>`;
+      }
+
+      let detailsHtml = '';
+      if (location) {
+           detailsHtml = `<span>${pickupPointLabel}: ${location}</span>`;
       }
+
+      html += `
+        <div class="shipment-item">
+          <div class="icon-container">
+            ${iconHtml}
+          </div>
+
+          <div class="content-right">
+              <div class="row-top">
+                  <div class="info-main">
+                      <div class="name">${friendlyName}</div>
+                      <div class="courier">${line2}</div>
+                  </div>
+                  <div class="status-badge ${statusInfo.class}">
+                      ${statusInfo.text}
+                  </div>
+              </div>
+
+              <div class="row-bottom">
+                  <div class="extra-info">
+                      ${codeHtml}${detailsHtml}
+                  </div>
+              </div>
+          </div>
+        </div>
+      `;
     });
 
     if (html === '') {
@@ -1,4 +1,7 @@
 """Helper functions for Polish Shipment Tracking."""
+from functools import lru_cache
+import re
+
 from .const import DOMAIN
 
 def get_parcel_id(data: dict, courier: str) -> str | None:
@@ -253,61 +256,90 @@ _STATUS_MAP = {
     },
 }
 
+# Substring fallbacks for statuses missing from _STATUS_MAP, in priority order.
+# Each rule is (status_key, haystack, needles); "lower" rules look at the
+# lower-cased status, "ascii" rules at its transliterated form and "exact"
+# rules compare the whole lower-cased status.
+_FALLBACK_RULES = [
+    ("waiting_for_pickup", "exact", ["ready"]),
+    ("waiting_for_pickup", "lower", ["delivered to locker", "delivered to point", "delivered to parcel locker", "delivered to pickup point"]),
+    ("delivered", "lower", ["picked up", "collected by", "collected"]),
+    ("waiting_for_pickup", "lower", ["ready for collection", "ready to pick", "ready for pick"]),
+    ("waiting_for_pickup", "lower", ["pickup", "collection", "locker"]),
+    ("delivered", "lower", ["delivered"]),
+    ("waiting_for_pickup", "ascii", ["awizo"]),
+    ("delivered", "ascii", ["odebr", "wydan", "odebrane"]),
+    ("delivered", "ascii", ["dorecz", "dostarcz"]),
+    ("returned", "ascii", ["zwrot", "odesl"]),
+    ("cancelled", "ascii", ["anul", "rezygn"]),
+    ("exception", "ascii", ["problem", "niedorecz", "odmow"]),
+    ("handed_out_for_delivery", "lower", ["out for delivery", "handed over for delivery"]),
+    ("returned", "lower", ["return", "returned"]),
+    ("cancelled", "lower", ["cancel", "canceled", "cancelled"]),
+    ("exception", "lower", ["fail", "failed", "delay", "exception", "undeliver", "missing", "rejected"]),
+    ("in_transport", "lower", ["transit", "in transport", "departed", "arrived", "processed", "received", "adopted"]),
+    ("created", "lower", ["created", "pre-transit", "label", "confirmed", "info received", "ready to send"]),
+]
+
+_ASCII_TRANSLATION = str.maketrans("ąćęłńóśżź", "acelnoszz")
+_HAYSTACK_SEPARATOR = "\x00"
+_STATUS_CACHE_SIZE = 4096
+
+
+def _compile_fallback_rules(rules):
+    """Compile the fallback rules into one anchored regex.
+
+    The matcher runs against ``"<lower>\\x00<ascii>"``. Every rule is a
+    lookahead alternative tried in list order, so the first rule with a hit
+    wins exactly like the original chain of ``if`` statements, and
+    ``match.lastgroup`` names the winning rule.
+    """
+    scopes = {
+        "exact": "(?={needles}\x00)",
+        "lower": "(?=[^\x00]*?(?:{needles}))",
+        "ascii": "(?=[^\x00]*\x00.*?(?:{needles}))",
+    }
+    alternatives = []
+    statuses = {}
+    for index, (status_key, scope, needles) in enumerate(rules):
+        group = f"r{index}"
+        pattern = "|".join(re.escape(needle) for needle in needles)
+        alternatives.append(scopes[scope].format(needles=f"(?:{pattern})") + f"(?P<{group}>)")
+        statuses[group] = status_key
+    return re.compile("(?:" + "|".join(alternatives) + ")", re.DOTALL), statuses
+
+
+_FALLBACK_RE, _FALLBACK_STATUSES = _compile_fallback_rules(_FALLBACK_RULES)
+
+
 def normalize_status(raw_status, courier):
     """Normalize status to one of the predefined keys."""
     status_text = str(raw_status or "").strip()
     if not status_text:
         return "unknown"
+    return _normalize_status_text(courier, status_text)
 
+
+@lru_cache(maxsize=_STATUS_CACHE_SIZE)
+def _normalize_status_text(courier, status_text):
+    """Map a stripped, non-empty status text; memoized per (courier, status)."""
     status_upper = status_text.upper()
     courier_map = _STATUS_MAP.get(courier, {})
     if status_upper in courier_map:
         return courier_map[status_upper]
 
-    status_lower = status_text.lower()
-    status_ascii = status_lower.translate(str.maketrans("ąćęłńóśżź", "acelnoszz"))
-    
-    # Generic fallbacks
-    if status_lower in {"ready"}:
-        return "waiting_for_pickup"
-    if any(x in status_lower for x in ["delivered to locker", "delivered to point", "delivered to parcel locker", "delivered to pickup point"]):
-        return "waiting_for_pickup"
-    if any(x in status_lower for x in ["picked up", "collected by", "collected"]):
-        return "delivered"
-    if any(x in status_lower for x in ["ready for collection", "ready to pick", "ready for pick"]):
-        return "waiting_for_pickup"
-    if any(x in status_lower for x in ["pickup", "collection", "locker"]):
-        return "waiting_for_pickup"
-    if "delivered" in status_lower:
-        return "delivered"
-    if "awizo" in status_ascii:
-        return "waiting_for_pickup"
-    if any(x in status_ascii for x in ["odebr", "wydan", "odebrane"]):
-        return "delivered"
-    if any(x in status_ascii for x in ["dorecz", "dostarcz"]):
-        return "delivered"
-    if any(x in status_ascii for x in ["zwrot", "odesl"]):
-        return "returned"
-    if any(x in status_ascii for x in ["anul", "rezygn"]):
-        return "cancelled"
-    if any(x in status_ascii for x in ["problem", "niedorecz", "odmow"]):
-        return "exception"
-    if any(x in status_lower for x in ["out for delivery", "handed over for delivery"]):
-        return "handed_out_for_delivery"
-    if any(x in status_lower for x in ["return", "returned"]):
-        return "returned"
-    if any(x in status_lower for x in ["cancel", "canceled", "cancelled"]):
-        return "cancelled"
-    if any(x in status_lower for x in ["fail", "failed", "delay", "exception", "undeliver", "missing", "rejected"]):
-        return "exception"
-    if any(x in status_lower for x in ["transit", "in transport", "departed", "arrived", "processed", "received", "adopted"]):
-        return "in_transport"
-    if any(x in status_lower for x in ["created", "pre-transit", "label", "confirmed", "info received", "ready to send"]):
-        return "created"
-
+    # The separator never appears in a needle, so swapping it out of the
+    # input cannot change which substrings match.
+    status_lower = status_text.lower().replace(_HAYSTACK_SEPARATOR, "\x01")
+    status_ascii = status_lower.translate(_ASCII_TRANSLATION)
+    match = _FALLBACK_RE.match(f"{status_lower}{_HAYSTACK_SEPARATOR}{status_ascii}")
+    if match:
+        return _FALLBACK_STATUSES[match.lastgroup]
     return "unknown"
 
+TERMINAL_STATUSES = frozenset({"delivered", "returned", "cancelled"})
+
 def is_delivered(data: dict, courier: str) -> bool:
     """Check if parcel is delivered."""
     status_key = normalize_status(get_raw_status(data, courier), courier)
-    return status_key in {"delivered", "returned", "cancelled"}
+    return status_key in TERMINAL_STATUSES
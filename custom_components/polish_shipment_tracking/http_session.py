@@ -0,0 +1,114 @@
+"""Integration-owned HTTP sessions for Polish Shipment Tracking."""
+from __future__ import annotations
+
+import asyncio
+import logging
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE, async_create_clientsession
+from homeassistant.helpers.json import json_dumps
+from homeassistant.util.ssl import get_default_context
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Connections of one courier; HostLimiter keeps requests per host lower.
+CONNECTOR_LIMIT = 20
+CONNECTOR_LIMIT_PER_HOST = 8
+DNS_CACHE_TTL = 300  # seconds
+# Long enough for a pre-connected socket to still be open at refresh time.
+KEEPALIVE_TIMEOUT = 90.0
+# How long before a scheduled refresh the connection is opened.
+PRECONNECT_LEAD = 20.0
+PRECONNECT_TIMEOUT = 10.0
+
+# Host each courier's parcel list is fetched from.
+PRECONNECT_URLS = {
+    "inpost": "https://api-inmobile-pl.easypack24.net/",
+    "dpd": "https://mobapp.dpd.com.pl/",
+    "dhl": "https://mojdhl.pl/",
+    "pocztex": "https://aplikacja.pocztex.pl/",
+}
+
+
+class CourierSession:
+    """A ClientSession shared by the accounts of one courier."""
+
+    def __init__(self, courier: str) -> None:
+        self.courier = courier
+        self.users = 0
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTOR_LIMIT,
+            limit_per_host=CONNECTOR_LIMIT_PER_HOST,
+            use_dns_cache=True,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            enable_cleanup_closed=True,
+            ssl=get_default_context(),
+        )
+        # aiohttp offers gzip/deflate (and brotli when installed) and
+        # decompresses the answer. Every account of the courier shares this
+        # session, so it stores no cookies; APIs keep their own per account.
+        self.session = aiohttp.ClientSession(
+            connector=connector,
+            cookie_jar=aiohttp.DummyCookieJar(),
+            headers={"User-Agent": SERVER_SOFTWARE},
+            json_serialize=json_dumps,
+            auto_decompress=True,
+        )
+
+    async def async_preconnect(self) -> None:
+        """Open a keep-alive connection so the refresh skips DNS and TLS setup."""
+        url = PRECONNECT_URLS.get(self.courier)
+        if url is None or self.session.closed:
+            return
+        try:
+            async with self.session.head(
+                url,
+                allow_redirects=False,
+                timeout=aiohttp.ClientTimeout(total=PRECONNECT_TIMEOUT),
+            ):
+                pass
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            _LOGGER.debug("Pre-connecting to %s failed: %s", self.courier, err)
+
+
+@callback
+def async_acquire_session(hass: HomeAssistant, courier: str) -> CourierSession:
+    """Return the courier's dedicated session, creating it on first use."""
+    sessions = hass.data.setdefault(DOMAIN, {}).setdefault("_sessions", {})
+    courier_session = sessions.get(courier)
+    if courier_session is None or courier_session.session.closed:
+        courier_session = sessions[courier] = CourierSession(courier)
+    courier_session.users += 1
+    return courier_session
+
+
+async def async_release_session(hass: HomeAssistant, courier_session: CourierSession) -> None:
+    """Drop one user of a dedicated session and close it after the last."""
+    courier_session.users -= 1
+    if courier_session.users > 0:
+        return
+    sessions = hass.data.get(DOMAIN, {}).get("_sessions", {})
+    if sessions.get(courier_session.courier) is courier_session:
+        del sessions[courier_session.courier]
+    await courier_session.session.close()
+
+
+@callback
+def async_get_cookieless_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """Return a Home Assistant session that stores no cookies.
+
+    For APIs keeping cookies per account: a session jar would merge one
+    account's cookies into the requests of another.
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    session = domain_data.get("_cookieless_session")
+    if session is None or session.closed:
+        session = domain_data["_cookieless_session"] = async_create_clientsession(
+            hass, cookie_jar=aiohttp.DummyCookieJar()
+        )
+    return session
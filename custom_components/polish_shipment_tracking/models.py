@@ -0,0 +1,275 @@
+"""Normalized parcel records for Polish Shipment Tracking."""
+from __future__ import annotations
+
+import hashlib
+import time
+from typing import Any
+
+from .helpers import TERMINAL_STATUSES, get_parcel_id, get_raw_status, normalize_status
+
+
+class Parcel:
+    """Courier-agnostic view of a single shipment.
+
+    Records are built once per coordinator refresh and treated as read-only
+    afterwards, so sensors never have to walk the courier JSON themselves.
+    """
+
+    __slots__ = (
+        "parcel_id",
+        "courier",
+        "status_raw",
+        "status_key",
+        "terminal",
+        "sender",
+        "location",
+        "pickup_code",
+        "fetched_at",
+        "attributes",
+        "raw",
+        "history",
+        "_fingerprint",
+    )
+
+    def __init__(
+        self,
+        parcel_id: str,
+        courier: str,
+        status_raw: str | None,
+        *,
+        sender: str | None = None,
+        location: str | None = None,
+        pickup_code: str | None = None,
+        fetched_at: float | None = None,
+        attributes: dict[str, Any] | None = None,
+        raw: Any = None,
+        history: list[dict[str, Any]] | None = None,
+    ) -> None:
+        """Initialize the record and derive the normalized status."""
+        self.parcel_id = parcel_id
+        self.courier = courier
+        self.status_raw = status_raw
+        self.status_key = normalize_status(status_raw, courier)
+        self.terminal = self.status_key in TERMINAL_STATUSES
+        self.sender = sender
+        self.location = location
+        self.pickup_code = pickup_code
+        self.fetched_at = time.time() if fetched_at is None else fetched_at
+        # Courier specific state attributes, keyed exactly as exposed.
+        self.attributes = attributes or {}
+        # Payload exposed to the card as ``raw_response``.
+        self.raw = raw
+        # Courier tracking events, normalized by ``history_events``.
+        self.history = history or []
+        self._fingerprint: str | None = None
+
+    @property
+    def fingerprint(self) -> str:
+        """Digest of everything a sensor exposes, computed on first use.
+
+        ``repr`` is much cheaper than JSON encoding and is stable for the
+        same decoded payload, which is all a change check needs.
+        """
+        if self._fingerprint is None:
+            content = (
+                self.status_raw,
+                self.sender,
+                self.location,
+                self.pickup_code,
+                self.attributes,
+                self.raw,
+            )
+            self._fingerprint = hashlib.blake2b(
+                repr(content).encode(), digest_size=16
+            ).hexdigest()
+        return self._fingerprint
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a JSON serializable form for the parcel snapshot."""
+        return {
+            "parcel_id": self.parcel_id,
+            "courier": self.courier,
+            "status_raw": self.status_raw,
+            "sender": self.sender,
+            "location": self.location,
+            "pickup_code": self.pickup_code,
+            "fetched_at": self.fetched_at,
+            "attributes": self.attributes,
+            "raw": self.raw,
+            "history": self.history,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Parcel:
+        """Rebuild a record saved with ``as_dict``; the status is normalized again."""
+        return cls(
+            data["parcel_id"],
+            data["courier"],
+            data.get("status_raw"),
+            sender=data.get("sender"),
+            location=data.get("location"),
+            pickup_code=data.get("pickup_code"),
+            fetched_at=data.get("fetched_at"),
+            attributes=data.get("attributes"),
+            raw=data.get("raw"),
+            history=data.get("history"),
+        )
+
+    def __repr__(self) -> str:
+        return f"<Parcel {self.courier} {self.parcel_id} {self.status_key}>"
+
+
+# Where couriers keep their tracking events, and the field names of one event.
+_HISTORY_KEYS = ("statusHistory", "history", "events", "trackingEvents", "parcelEvents")
+_EVENT_TIME_KEYS = ("date", "eventDate", "stateDate", "dateTime", "time", "timestamp")
+_EVENT_STATUS_KEYS = ("status", "state", "code", "name", "description")
+_EVENT_DESCRIPTION_KEYS = ("description", "stateDescription", "statusDescription", "name")
+_EVENT_LOCATION_KEYS = ("location", "place", "city", "unit", "office", "postOffice")
+
+
+def _first_text(event: dict, keys: tuple[str, ...]) -> str | None:
+    for key in keys:
+        value = event.get(key)
+        if isinstance(value, bool):
+            continue
+        if isinstance(value, (str, int, float)) and value != "":
+            return str(value)
+        if isinstance(value, dict):
+            name = value.get("name") or value.get("description")
+            if isinstance(name, str) and name:
+                return name
+    return None
+
+
+def history_events(data: Any) -> list[dict[str, Any]]:
+    """Return the courier's tracking events as ``time``/``status`` dicts.
+
+    Event shapes differ per courier and endpoint, so the usual field names
+    are probed; events without a time or a status are skipped.
+    """
+    if not isinstance(data, dict):
+        return []
+    items = next(
+        (data[key] for key in _HISTORY_KEYS if isinstance(data.get(key), list)), []
+    )
+    events = []
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        time_text = _first_text(item, _EVENT_TIME_KEYS)
+        status = _first_text(item, _EVENT_STATUS_KEYS)
+        if time_text is None or status is None:
+            continue
+        event = {"time": time_text, "status": status}
+        description = _first_text(item, _EVENT_DESCRIPTION_KEYS)
+        if description is not None and description != status:
+            event["description"] = description
+        location = _first_text(item, _EVENT_LOCATION_KEYS)
+        if location is not None:
+            event["location"] = location
+        events.append(event)
+    return events
+
+
+def _adapt_inpost(data: dict) -> dict[str, Any]:
+    attrs: dict[str, Any] = {}
+    sender = None
+    location = None
+
+    sender_data = data.get("sender")
+    if isinstance(sender_data, dict):
+        sender = sender_data.get("name")
+        attrs["sender"] = sender
+
+    pickup_point = data.get("pickUpPoint")
+    if isinstance(pickup_point, dict):
+        address = pickup_point.get("addressDetails") or {}
+        street = address.get("street") or ""
+        building = address.get("buildingNumber") or ""
+        city = address.get("city") or ""
+        parts = [p for p in [street, building, city] if p]
+        location = ", ".join(parts)
+        attrs["location"] = location
+
+    pickup_code = data.get("openCode")
+    attrs["open_code"] = pickup_code
+
+    receiver = data.get("receiver")
+    if isinstance(receiver, dict):
+        phone = receiver.get("phoneNumber")
+        if isinstance(phone, dict):
+            attrs["phone_number"] = phone.get("value")
+
+    return {
+        "sender": sender,
+        "location": location,
+        "pickup_code": pickup_code,
+        "attributes": attrs,
+        "raw": data,
+    }
+
+
+def _adapt_dpd(data: dict) -> dict[str, Any]:
+    attrs: dict[str, Any] = {}
+    sender = None
+    sender_data = data.get("sender")
+    if isinstance(sender_data, dict):
+        sender = sender_data.get("name")
+        attrs["sender"] = sender
+    return {"sender": sender, "attributes": attrs, "raw": data}
+
+
+def _adapt_generic(data: dict) -> dict[str, Any]:
+    return {"raw": data}
+
+
+def _adapt_pocztex(data: dict) -> dict[str, Any]:
+    sender = data.get("senderName")
+    attrs: dict[str, Any] = {
+        "sender_name": sender,
+        "recipient_name": data.get("recipientName"),
+        "state_date": data.get("stateDate"),
+        "direction": data.get("direction"),
+        "pickup_date": data.get("pickupDate"),
+    }
+    # The tracking history goes to the timeline store, not to attributes.
+    # Keep only the details payload; the merged list item is not needed later.
+    raw = data["_raw_response"] if "_raw_response" in data else data
+    return {"sender": sender, "attributes": attrs, "raw": raw}
+
+
+_ADAPTERS = {
+    "inpost": _adapt_inpost,
+    "dpd": _adapt_dpd,
+    "dhl": _adapt_generic,
+    "pocztex": _adapt_pocztex,
+}
+
+
+def build_parcel(data: dict, courier: str, fetched_at: float | None = None) -> Parcel | None:
+    """Build a record from one courier payload, or None without a parcel ID."""
+    if not isinstance(data, dict):
+        return None
+    parcel_id = get_parcel_id(data, courier)
+    if not parcel_id:
+        return None
+    adapter = _ADAPTERS.get(courier, _adapt_generic)
+    return Parcel(
+        parcel_id,
+        courier,
+        get_raw_status(data, courier),
+        fetched_at=fetched_at,
+        history=history_events(data),
+        **adapter(data),
+    )
+
+
+def build_parcels(items: list, courier: str) -> list[Parcel]:
+    """Build records for every parcel in a courier response."""
+    fetched_at = time.time()
+    parcels = []
+    for data in items:
+        parcel = build_parcel(data, courier, fetched_at)
+        if parcel is not None:
+            parcels.append(parcel)
+    return parcels
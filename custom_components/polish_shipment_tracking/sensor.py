@@ -1,31 +1,61 @@
 """Sensor platform for Polish Shipment Tracking."""
 from __future__ import annotations
 
+from collections import Counter, OrderedDict
 import json
 import logging
 from typing import Any
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
-from homeassistant.const import EVENT_HOMEASSISTANT_STARTED
+from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, EntityCategory, UnitOfTime
 from homeassistant.helpers.device_registry import DeviceInfo
-from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
+from homeassistant.helpers.entity_registry import (
+    async_entries_for_config_entry,
+    async_get as async_get_entity_registry,
+)
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN, INTEGRATION_VERSION, CONF_PHONE, CONF_EMAIL
-from .coordinator import ShipmentCoordinator
-from .helpers import (
-    get_parcel_id,
-    get_raw_status,
-    is_delivered,
-    normalize_status,
+from .const import (
+    DOMAIN,
+    INTEGRATION_VERSION,
+    CONF_PHONE,
+    CONF_EMAIL,
+    CONF_AGGREGATED_EVENTS,
 )
+from .coordinator import AccountView, ShipmentCoordinator
+from .models import Parcel
 
 _LOGGER = logging.getLogger(__name__)
 
 ACTIVE_SHIPMENTS_UNIQUE_ID = f"{DOMAIN}_active_shipments"
 
+
+def _update_interval_unique_id(entry: ConfigEntry) -> str:
+    return f"{entry.entry_id}_update_interval"
+
+
+def _device_info(coordinator: ShipmentCoordinator) -> DeviceInfo:
+    """Return the device grouping all entities of one account."""
+    courier = coordinator.courier
+    account_id = coordinator.entry.data.get(CONF_PHONE) or coordinator.entry.data.get(CONF_EMAIL)
+    return DeviceInfo(
+        identifiers={(DOMAIN, coordinator.entry.entry_id)},
+        name=f"{courier.title()} ({account_id})",
+        manufacturer="Polish Shipment Tracking",
+        model=courier.title(),
+        sw_version=INTEGRATION_VERSION,
+    )
+
+EVENT_NEW_SHIPMENT = f"{DOMAIN}_new_shipment"
+EVENT_STATUS_CHANGED = f"{DOMAIN}_shipment_status_changed"
+EVENT_SHIPMENTS_UPDATED = f"{DOMAIN}_shipments_updated"
+
+# Events held until Home Assistant has started; the oldest are dropped
+# beyond this.
+MAX_PENDING_EVENTS = 500
+
 @callback
 def _ensure_pending_events_listener(hass: HomeAssistant) -> None:
     domain_data = hass.data.setdefault(DOMAIN, {})
@@ -36,21 +66,74 @@ def _ensure_pending_events_listener(hass: HomeAssistant) -> None:
 
     @callback
     def _flush_pending_events(_: Any) -> None:
-        pending = domain_data.pop("_pending_events", [])
+        pending = domain_data.pop("_pending_events", {})
         domain_data.pop("_pending_events_listener", None)
-        for event_type, event_data in pending:
+        for event_type, event_data in pending.values():
             hass.bus.async_fire(event_type, event_data)
 
     hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STARTED, _flush_pending_events)
 
+def _pending_event_key(event_type: str, event_data: dict[str, Any]) -> tuple:
+    if event_type == EVENT_SHIPMENTS_UPDATED:
+        return (event_type, event_data["entry_id"])
+    return (event_type, event_data["courier"], event_data["shipment_id"])
+
+def _merge_transition(older: dict[str, Any], newer: dict[str, Any]) -> dict[str, Any]:
+    """Collapse two status transitions of one shipment into one."""
+    return {
+        **newer,
+        "old_status_raw": older["old_status_raw"],
+        "old_status_key": older["old_status_key"],
+    }
+
+def _merge_shipments_updated(older: dict[str, Any], newer: dict[str, Any]) -> dict[str, Any]:
+    added = {item["shipment_id"]: item for item in older["added"]}
+    added.update((item["shipment_id"], item) for item in newer["added"])
+    changed = {item["shipment_id"]: item for item in older["changed"]}
+    for item in newer["changed"]:
+        previous = changed.get(item["shipment_id"])
+        changed[item["shipment_id"]] = _merge_transition(previous, item) if previous else item
+    gone = set(newer["removed"])
+    # A shipment added and removed while queued was never announced.
+    older_added = {item["shipment_id"] for item in older["added"]}
+    newer_added = {item["shipment_id"] for item in newer["added"]}
+    removed = (gone - older_added) | (set(older["removed"]) - newer_added)
+    # Removed shipments keep their transition, e.g. the one to delivered.
+    unannounced = gone & older_added
+    return {
+        **newer,
+        "added": [item for key, item in added.items() if key not in gone],
+        "changed": [
+            item
+            for key, item in changed.items()
+            if key not in unannounced and item["old_status_key"] != item["new_status_key"]
+        ],
+        "removed": sorted(removed),
+    }
+
 @callback
 def _queue_or_fire_event(hass: HomeAssistant, event_type: str, event_data: dict[str, Any]) -> None:
     if hass.is_running:
         hass.bus.async_fire(event_type, event_data)
         return
 
+    # Before startup keep one event per shipment (or per entry for the
+    # aggregated event), folding repeated transitions into the latest.
     domain_data = hass.data.setdefault(DOMAIN, {})
-    domain_data.setdefault("_pending_events", []).append((event_type, event_data))
+    pending: OrderedDict = domain_data.setdefault("_pending_events", OrderedDict())
+    key = _pending_event_key(event_type, event_data)
+    queued = pending.pop(key, None)
+    if queued is not None:
+        if event_type == EVENT_STATUS_CHANGED:
+            event_data = _merge_transition(queued[1], event_data)
+            if event_data["old_status_key"] == event_data["new_status_key"]:
+                return
+        elif event_type == EVENT_SHIPMENTS_UPDATED:
+            event_data = _merge_shipments_updated(queued[1], event_data)
+    pending[key] = (event_type, event_data)
+    while len(pending) > MAX_PENDING_EVENTS:
+        dropped_type, _ = pending.popitem(last=False)[1]
+        _LOGGER.debug("Pending event queue full, dropping oldest %s", dropped_type)
     _ensure_pending_events_listener(hass)
 
 async def async_setup_entry(
@@ -59,7 +142,13 @@ async def async_setup_entry(
     async_add_entities,
 ) -> None:
     """Set up the sensor platform."""
-    coordinator: ShipmentCoordinator = hass.data[DOMAIN][entry.entry_id]
+    view: AccountView = hass.data[DOMAIN][entry.entry_id]
+    if not view.is_primary:
+        # Another entry of the same account owns the entities; drop the
+        # duplicates this entry registered before it was shared.
+        _async_remove_old_entities(hass, entry, view.coordinator, set(), primary=False)
+        return
+    coordinator = view.coordinator
 
     # Handle global active shipments sensor
     if "_active_shipments_sensor" not in hass.data[DOMAIN]:
@@ -71,34 +160,40 @@ async def async_setup_entry(
     global_sensor.attach_coordinator(coordinator)
     entry.async_on_unload(lambda: global_sensor.detach_coordinator(coordinator))
 
+    async_add_entities([UpdateIntervalSensor(coordinator)])
+
     @callback
     def _build_new_shipment_event_data(sensor: "ShipmentSensor") -> dict[str, Any]:
-        raw_status = get_raw_status(sensor.parcel_data, coordinator.courier)
         return {
             "courier": coordinator.courier,
             "shipment_id": sensor._tracking_number,
             "entity_id": getattr(sensor, "entity_id", None),
-            "status_raw": raw_status,
-            "status_key": normalize_status(raw_status, coordinator.courier),
+            "status_raw": sensor.parcel.status_raw,
+            "status_key": sensor.parcel.status_key,
         }
 
 
+    registry_synced = False
+    reported_index = None
+
     @callback
     def async_update_parcels() -> None:
         """Add new sensors and remove old ones."""
-        current_data = coordinator.data or []
+        nonlocal registry_synced, reported_index
         new_entities = []
-        
-        current_ids = set()
-        for parcel in current_data:
-            pid = get_parcel_id(parcel, coordinator.courier)
-            if not pid or is_delivered(parcel, coordinator.courier):
-                continue
-            
-            current_ids.add(pid)
+        # Listeners also run when only availability changed; report each
+        # parcel list once.
+        new_list = coordinator.parcels_by_id is not reported_index
+        reported_index = coordinator.parcels_by_id
+        removed = coordinator.removed_ids & coordinator.known_parcels
+
+        # After setup only the coordinator's added/removed sets matter; the
+        # first run covers every active parcel and syncs the registry.
+        candidates = coordinator.added_ids if registry_synced else coordinator.active_ids
+        for pid in candidates:
             if pid not in coordinator.known_parcels:
                 coordinator.known_parcels.add(pid)
-                new_entities.append(ShipmentSensor(coordinator, parcel, pid))
+                new_entities.append(ShipmentSensor(coordinator, coordinator.parcels_by_id[pid]))
         
         if new_entities:
             async_add_entities(new_entities)
@@ -107,39 +202,117 @@ async def async_setup_entry(
             for new_sensor in new_entities:
                 _queue_or_fire_event(
                     hass,
-                    f"{DOMAIN}_new_shipment",
+                    EVENT_NEW_SHIPMENT,
                     _build_new_shipment_event_data(new_sensor),
                 )
 
-        # Remove entities that are no longer present
-        _async_remove_old_entities(hass, entry, coordinator, current_ids)
-        
-        # Keep track of active parcels for this coordinator
-        coordinator.known_parcels.intersection_update(current_ids)
+        # Collected before the removal below so parcels that just became
+        # terminal still resolve their entity_id.
+        changed = (
+            _build_status_changes(hass, coordinator)
+            if new_list and entry.options.get(CONF_AGGREGATED_EVENTS, False)
+            else None
+        )
+
+        # Remove entities that are no longer present. The registry is only
+        # consulted when a known parcel went away, plus once after setup to
+        # drop leftovers from before the restart.
+        if not registry_synced or not coordinator.removed_ids.isdisjoint(coordinator.known_parcels):
+            current_ids = set(coordinator.active_ids)
+            _async_remove_old_entities(hass, entry, coordinator, current_ids)
+            coordinator.known_parcels.intersection_update(current_ids)
+            registry_synced = True
+
+        if changed is not None:
+            _async_fire_shipments_updated(
+                hass,
+                entry,
+                coordinator,
+                [_build_new_shipment_event_data(sensor) for sensor in new_entities],
+                changed,
+                removed,
+            )
 
     entry.async_on_unload(coordinator.async_add_listener(async_update_parcels))
     async_update_parcels()
 
+@callback
+def _build_status_changes(
+    hass: HomeAssistant, coordinator: ShipmentCoordinator
+) -> list[dict[str, Any]]:
+    """Describe the status transitions of the latest refresh, terminal ones included."""
+    registry = async_get_entity_registry(hass)
+    previous = coordinator.previous_parcels_by_id
+    changed = []
+    for pid in sorted(coordinator.changed_ids):
+        old_parcel = previous.get(pid)
+        new_parcel = coordinator.parcels_by_id[pid]
+        if old_parcel is None or old_parcel.status_key == new_parcel.status_key:
+            continue
+        changed.append(
+            {
+                "courier": coordinator.courier,
+                "shipment_id": pid,
+                "entity_id": registry.async_get_entity_id(
+                    "sensor", DOMAIN, f"{coordinator.courier}_{pid}"
+                ),
+                "old_status_raw": old_parcel.status_raw,
+                "old_status_key": old_parcel.status_key,
+                "new_status_raw": new_parcel.status_raw,
+                "new_status_key": new_parcel.status_key,
+            }
+        )
+    return changed
+
+@callback
+def _async_fire_shipments_updated(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    coordinator: ShipmentCoordinator,
+    added: list[dict[str, Any]],
+    changed: list[dict[str, Any]],
+    removed: set[str],
+) -> None:
+    """Fire one event describing every change of a refresh, if there was any."""
+    if not (added or changed or removed):
+        return
+    _queue_or_fire_event(
+        hass,
+        EVENT_SHIPMENTS_UPDATED,
+        {
+            "courier": coordinator.courier,
+            "entry_id": entry.entry_id,
+            "added": added,
+            "changed": changed,
+            "removed": sorted(removed),
+        },
+    )
+
 def _async_remove_old_entities(
     hass: HomeAssistant,
     entry: ConfigEntry,
     coordinator: ShipmentCoordinator,
     current_ids: set[str],
+    primary: bool = True,
 ) -> None:
     """Remove entities that are no longer in the active parcels list."""
     registry = async_get_entity_registry(hass)
     current_unique_ids = {f"{coordinator.courier}_{pid}" for pid in current_ids}
-    
-    entities_to_remove = []
-    for entity_entry in registry.entities.values():
-        if (
-            entity_entry.platform == DOMAIN
-            and entity_entry.config_entry_id == entry.entry_id
-            and entity_entry.unique_id != ACTIVE_SHIPMENTS_UNIQUE_ID
-            and entity_entry.unique_id not in current_unique_ids
-        ):
-            entities_to_remove.append(entity_entry.entity_id)
-            
+    current_unique_ids.add(ACTIVE_SHIPMENTS_UNIQUE_ID)
+    if primary:
+        current_unique_ids.add(_update_interval_unique_id(entry))
+
+    # Only this entry's entities, via the registry's config entry index.
+    entry_entities = {
+        entity_entry.unique_id: entity_entry.entity_id
+        for entity_entry in async_entries_for_config_entry(registry, entry.entry_id)
+        if entity_entry.platform == DOMAIN
+    }
+    entities_to_remove = [
+        entry_entities[unique_id]
+        for unique_id in entry_entities.keys() - current_unique_ids
+    ]
+
     for entity_id in entities_to_remove:
         registry.async_remove(entity_id)
 
@@ -148,15 +321,18 @@ class ShipmentSensor(CoordinatorEntity[ShipmentCoordinator], SensorEntity):
 
     _attr_has_entity_name = True
     _attr_icon = "mdi:package-variant-closed"
+    # Multi-KB JSON that changes with every courier update; keep it out of
+    # the recorder database.
+    _unrecorded_attributes = frozenset({"raw_response"})
 
     def __init__(
         self,
         coordinator: ShipmentCoordinator,
-        parcel_data: dict,
-        tracking_number: str,
+        parcel: Parcel,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(coordinator)
+        tracking_number = parcel.parcel_id
         self._tracking_number = tracking_number
         self._courier = coordinator.courier
         
@@ -166,22 +342,19 @@ class ShipmentSensor(CoordinatorEntity[ShipmentCoordinator], SensorEntity):
         self._attr_name = f"{self._courier.title()} {parcel_word} {tracking_number}"
         self._attr_unique_id = f"{self._courier}_{tracking_number}"
         self._attr_translation_key = "shipment_status"
-        self.parcel_data = parcel_data
-
-        account_id = coordinator.entry.data.get(CONF_PHONE) or coordinator.entry.data.get(CONF_EMAIL)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.entry.entry_id)},
-            name=f"{self._courier.title()} ({account_id})",
-            manufacturer="Polish Shipment Tracking",
-            model=self._courier.title(),
-            sw_version=INTEGRATION_VERSION,
-        )
+        self.parcel = parcel
+        # (fingerprint, encoded JSON) of the last serialized raw payload.
+        self._raw_response_cache: tuple[str, str] | None = None
+        # Availability at the last state write; a recovery must be written
+        # even when the parcel itself did not change.
+        self._written_available = True
+
+        self._attr_device_info = _device_info(coordinator)
 
     @property
     def native_value(self) -> str:
         """Return the state of the sensor."""
-        raw_status = get_raw_status(self.parcel_data, self._courier)
-        return normalize_status(raw_status, self._courier)
+        return self.parcel.status_key
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -192,105 +365,121 @@ class ShipmentSensor(CoordinatorEntity[ShipmentCoordinator], SensorEntity):
             "integration_domain": DOMAIN,
         }
         
-        raw_status = get_raw_status(self.parcel_data, self._courier)
-        attrs["status_raw"] = raw_status
-        attrs["status_key"] = normalize_status(raw_status, self._courier)
-        
-        # Include raw response for the custom card
-        if "_raw_response" in self.parcel_data:
-            attrs["raw_response"] = json.dumps(self.parcel_data["_raw_response"], ensure_ascii=False)
-        else:
-            attrs["raw_response"] = json.dumps(self.parcel_data, ensure_ascii=False)
-            
-        # Add courier specific attributes
-        if self._courier == "inpost":
-            self._add_inpost_attributes(attrs)
-        elif self._courier == "dpd":
-            self._add_dpd_attributes(attrs)
-        elif self._courier == "pocztex":
-            self._add_pocztex_attributes(attrs)
-            
+        attrs["status_raw"] = self.parcel.status_raw
+        attrs["status_key"] = self.parcel.status_key
+
+        # Include raw response for the custom card, unless it is fetched on
+        # demand through the raw_response websocket command.
+        if not self.coordinator.raw_response_on_demand:
+            attrs["raw_response"] = self._encoded_raw_response()
+
+        # Courier specific attributes, precomputed by the parcel adapter
+        attrs.update(self.parcel.attributes)
+
         return attrs
 
-    def _add_inpost_attributes(self, attrs: dict) -> None:
-        """Add InPost specific attributes."""
-        sender = self.parcel_data.get("sender")
-        if isinstance(sender, dict):
-            attrs["sender"] = sender.get("name")
-            
-        pickup_point = self.parcel_data.get("pickUpPoint")
-        if isinstance(pickup_point, dict):
-            address = pickup_point.get("addressDetails") or {}
-            street = address.get("street") or ""
-            building = address.get("buildingNumber") or ""
-            city = address.get("city") or ""
-            parts = [p for p in [street, building, city] if p]
-            attrs["location"] = ", ".join(parts)
-            
-        attrs["open_code"] = self.parcel_data.get("openCode")
-        
-        receiver = self.parcel_data.get("receiver")
-        if isinstance(receiver, dict):
-            phone = receiver.get("phoneNumber")
-            if isinstance(phone, dict):
-                attrs["phone_number"] = phone.get("value")
-
-    def _add_dpd_attributes(self, attrs: dict) -> None:
-        """Add DPD specific attributes."""
-        sender = self.parcel_data.get("sender")
-        if isinstance(sender, dict):
-            attrs["sender"] = sender.get("name")
-
-    def _add_pocztex_attributes(self, attrs: dict) -> None:
-        """Add Pocztex specific attributes."""
-        attrs["sender_name"] = self.parcel_data.get("senderName")
-        attrs["recipient_name"] = self.parcel_data.get("recipientName")
-        attrs["state_date"] = self.parcel_data.get("stateDate")
-        attrs["direction"] = self.parcel_data.get("direction")
-        attrs["pickup_date"] = self.parcel_data.get("pickupDate")
-        history = self.parcel_data.get("history")
-        if isinstance(history, list):
-            attrs["history"] = history
+    def _encoded_raw_response(self) -> str:
+        """Return the JSON encoded raw payload, re-encoding only on change."""
+        fingerprint = self.parcel.fingerprint
+        cached = self._raw_response_cache
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, json.dumps(self.parcel.raw, ensure_ascii=False))
+            self._raw_response_cache = cached
+        return cached[1]
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
         # Find our parcel in the new data
-        current_data = self.coordinator.data or []
-        my_parcel = next(
-            (p for p in current_data if get_parcel_id(p, self._courier) == self._tracking_number),
-            None
-        )
-        
-        if my_parcel:
-            old_raw_status = get_raw_status(self.parcel_data, self._courier)
-            old_status_key = normalize_status(old_raw_status, self._courier)
+        my_parcel = self.coordinator.parcels_by_id.get(self._tracking_number)
 
-            new_raw_status = get_raw_status(my_parcel, self._courier)
-            new_status_key = normalize_status(new_raw_status, self._courier)
+        if my_parcel and (
+            self._tracking_number not in self.coordinator.changed_ids
+            and self.available == self._written_available
+        ):
+            # Same content as already written; only follow the new record.
+            self.parcel = my_parcel
+            return
 
-            if old_status_key != new_status_key:
+        if my_parcel:
+            old_parcel = self.parcel
+            if old_parcel.status_key != my_parcel.status_key:
                 event_data = {
                     "courier": self._courier,
                     "shipment_id": self._tracking_number,
                     "entity_id": getattr(self, "entity_id", None),
-                    "old_status_raw": old_raw_status,
-                    "old_status_key": old_status_key,
-                    "new_status_raw": new_raw_status,
-                    "new_status_key": new_status_key,
+                    "old_status_raw": old_parcel.status_raw,
+                    "old_status_key": old_parcel.status_key,
+                    "new_status_raw": my_parcel.status_raw,
+                    "new_status_key": my_parcel.status_key,
                 }
                 _queue_or_fire_event(
                     self.coordinator.hass,
-                    f"{DOMAIN}_shipment_status_changed",
+                    EVENT_STATUS_CHANGED,
                     event_data,
                 )
-            self.parcel_data = my_parcel
+            self.parcel = my_parcel
             self.async_write_ha_state()
+            self._written_available = self.available
         else:
             # If not found, it might be delivered or removed. 
             # The async_update_parcels listener will handle removal.
             pass
 
+class UpdateIntervalSensor(CoordinatorEntity[ShipmentCoordinator], SensorEntity):
+    """Diagnostic sensor showing how often the account is polled and why."""
+
+    _attr_has_entity_name = True
+    _attr_icon = "mdi:timer-sync-outline"
+    _attr_translation_key = "update_interval"
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+    # Counters and countdowns that change with nearly every refresh; each
+    # change would otherwise store a new state row.
+    _unrecorded_attributes = frozenset(
+        {
+            "scheduled_interval_seconds",
+            "circuit_retry_in_seconds",
+            "detail_cache_hits",
+            "detail_cache_misses",
+            "detail_cache_negative_hits",
+        }
+    )
+
+    def __init__(self, coordinator: ShipmentCoordinator) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self._attr_unique_id = _update_interval_unique_id(coordinator.entry)
+        self._attr_device_info = _device_info(coordinator)
+
+    @property
+    def available(self) -> bool:
+        """Stay available while the courier API is failing; the interval still applies."""
+        return True
+
+    @property
+    def native_value(self) -> float:
+        """Return the interval chosen from the active statuses, in minutes."""
+        return round(self.coordinator.poll_interval.total_seconds() / 60, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return why the interval was chosen and the polling diagnostics."""
+        attrs = {
+            "reason": self.coordinator.poll_reason,
+            "scheduled_interval_seconds": round(
+                self.coordinator.update_interval.total_seconds()
+            ),
+        }
+        for key, value in self.coordinator.circuit_breaker.as_dict().items():
+            attrs[f"circuit_{key}"] = value
+        detail_cache = getattr(self.coordinator.api, "detail_cache", None)
+        if detail_cache is not None:
+            for key, value in detail_cache.stats().items():
+                attrs[f"detail_cache_{key}"] = value
+        return attrs
+
 class ActiveShipmentsSensor(SensorEntity):
     """Sensor that counts active shipments across all accounts."""
 
@@ -305,28 +494,65 @@ class ActiveShipmentsSensor(SensorEntity):
         """Initialize the sensor."""
         self.hass = hass
         self._coordinators: dict[ShipmentCoordinator, Any] = {}
+        # Active parcels per status, as last reported by each coordinator.
+        self._counts: dict[ShipmentCoordinator, Counter[str]] = {}
+        self._by_status: Counter[str] = Counter()
+        self._by_courier: Counter[str] = Counter()
 
     def attach_coordinator(self, coordinator: ShipmentCoordinator) -> None:
         """Attach a coordinator to this sensor."""
         if coordinator not in self._coordinators:
             self._coordinators[coordinator] = coordinator.async_add_listener(
-                self.async_write_ha_state
+                lambda: self._async_coordinator_updated(coordinator)
             )
+            self._async_coordinator_updated(coordinator)
 
     def detach_coordinator(self, coordinator: ShipmentCoordinator) -> None:
         """Detach a coordinator from this sensor."""
         if coordinator in self._coordinators:
             unregister = self._coordinators.pop(coordinator)
             unregister()
+            counts = self._counts.pop(coordinator, None)
+            if counts:
+                self._apply_counts(coordinator.courier, counts, -1)
+                self._async_write_if_added()
+
+    @callback
+    def _async_coordinator_updated(self, coordinator: ShipmentCoordinator) -> None:
+        """Fold a coordinator's new counts into the totals; write only on change."""
+        counts = coordinator.active_counts
+        previous = self._counts.get(coordinator)
+        if previous == counts:
+            return
+
+        if previous:
+            self._apply_counts(coordinator.courier, previous, -1)
+        self._apply_counts(coordinator.courier, counts, 1)
+        self._counts[coordinator] = counts
+        self._async_write_if_added()
+
+    def _apply_counts(self, courier: str, counts: Counter[str], sign: int) -> None:
+        for status_key, count in counts.items():
+            self._by_status[status_key] += sign * count
+        self._by_courier[courier] += sign * sum(counts.values())
+        # Drop zero entries so the attributes only list what is active.
+        self._by_status = +self._by_status
+        self._by_courier = +self._by_courier
+
+    @callback
+    def _async_write_if_added(self) -> None:
+        if self.entity_id is not None:
             self.async_write_ha_state()
 
     @property
     def native_value(self) -> int:
         """Return the total count of active shipments."""
-        total = 0
-        for coordinator in self._coordinators:
-            data = coordinator.data or []
-            for parcel in data:
-                if not is_delivered(parcel, coordinator.courier):
-                    total += 1
-        return total
+        return sum(self._by_status.values())
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return active shipment counts per status and per courier."""
+        return {
+            "by_status": dict(sorted(self._by_status.items())),
+            "by_courier": dict(sorted(self._by_courier.items())),
+        }
@@ -0,0 +1,202 @@
+"""Per-parcel tracking timeline for Polish Shipment Tracking."""
+from __future__ import annotations
+
+import bisect
+from datetime import datetime, timedelta, timezone
+import logging
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .models import Parcel
+
+_LOGGER = logging.getLogger(__name__)
+
+TIMELINE_VERSION = 1
+TIMELINE_SAVE_DELAY = 30  # seconds
+# Oldest events are dropped beyond this, per parcel.
+MAX_EVENTS_PER_PARCEL = 200
+# Parcels not returned by the courier for this long are forgotten.
+TIMELINE_RETENTION = timedelta(days=30)
+MAX_PARCELS = 500
+
+
+def timeline_store(hass: HomeAssistant, entry_id: str) -> Store:
+    """Return the storage helper holding an entry's tracking timelines."""
+    return Store(hass, TIMELINE_VERSION, f"{DOMAIN}.{entry_id}.timeline")
+
+
+def _event_key(event: dict[str, Any]) -> tuple:
+    return (event.get("time"), event.get("status"), event.get("location"))
+
+
+def _event_timestamp(value: Any) -> float | None:
+    """Return a courier event time as epoch seconds, or None if unreadable.
+
+    Couriers send ISO strings, with or without an offset (then local time),
+    or epoch seconds or milliseconds.
+    """
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        number = None
+    if number is not None:
+        return number / 1000 if number > 1e11 else number
+    if not isinstance(value, str):
+        return None
+    parsed = dt_util.parse_datetime(value.strip())
+    if parsed is None:
+        return None
+    return dt_util.as_utc(parsed).timestamp()
+
+
+def _observed_event(parcel: Parcel) -> dict[str, Any]:
+    """Status change seen by polling, for couriers that return no history."""
+    observed = datetime.fromtimestamp(parcel.fetched_at, timezone.utc)
+    return {
+        "time": observed.isoformat(timespec="seconds"),
+        "timestamp": parcel.fetched_at,
+        "status": parcel.status_raw,
+        "observed": True,
+    }
+
+
+class TimelineStore:
+    """Deduplicated tracking events of every parcel of an account.
+
+    Events are kept in time order, oldest first; one already stored (same
+    time, status and location) is never added again, and neither is one
+    older than the events trimmed from a full timeline. Status changes
+    observed by polling only stand in until the courier returns a history.
+    Writes are debounced, so a refresh that brings nothing new costs no
+    disk IO.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store = timeline_store(hass, entry_id)
+        # parcel_id -> {"courier", "last_seen", "events"}
+        self._timelines: dict[str, dict[str, Any]] = {}
+        self._keys: dict[str, set[tuple]] = {}
+
+    async def async_load(self) -> None:
+        """Load the stored timelines; a broken store starts empty."""
+        try:
+            data = await self._store.async_load()
+        except Exception as err:
+            _LOGGER.warning("Failed to load tracking timelines: %s", err)
+            return
+        if not isinstance(data, dict):
+            return
+        for parcel_id, timeline in (data.get("parcels") or {}).items():
+            if not isinstance(timeline, dict) or not isinstance(timeline.get("events"), list):
+                continue
+            for event in timeline["events"]:
+                if "timestamp" not in event:
+                    event["timestamp"] = _event_timestamp(event.get("time")) or 0.0
+            timeline["events"].sort(key=lambda event: event["timestamp"])
+            self._timelines[parcel_id] = timeline
+            self._keys[parcel_id] = {_event_key(event) for event in timeline["events"]}
+
+    def move_to(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Keep the timelines under another entry from now on."""
+        self._store = timeline_store(hass, entry_id)
+        self._store.async_delay_save(self._data, TIMELINE_SAVE_DELAY)
+
+    def record(self, parcels: list[Parcel]) -> None:
+        """Append the events of ``parcels`` not stored yet."""
+        now = time.time()
+        changed = False
+        for parcel in parcels:
+            timeline = self._timelines.get(parcel.parcel_id)
+            if timeline is None:
+                timeline = self._timelines[parcel.parcel_id] = {
+                    "courier": parcel.courier,
+                    "events": [],
+                }
+                self._keys[parcel.parcel_id] = set()
+                changed = True
+            timeline["last_seen"] = now
+            if self._append(parcel, timeline):
+                changed = True
+        if self._prune(now):
+            changed = True
+        if changed:
+            self._store.async_delay_save(self._data, TIMELINE_SAVE_DELAY)
+
+    def _append(self, parcel: Parcel, timeline: dict[str, Any]) -> bool:
+        events = timeline["events"]
+        keys = self._keys[parcel.parcel_id]
+        changed = False
+        if parcel.history:
+            candidates = parcel.history
+            # The courier's own events replace what polling observed.
+            if any(event.get("observed") for event in events):
+                events[:] = [event for event in events if not event.get("observed")]
+                keys.clear()
+                keys.update(_event_key(event) for event in events)
+                changed = True
+        elif parcel.status_raw and not (events and events[-1].get("status") == parcel.status_raw):
+            candidates = [_observed_event(parcel)]
+        else:
+            return False
+        trimmed_before = timeline.get("trimmed_before")
+        for event in candidates:
+            key = _event_key(event)
+            if key in keys:
+                continue
+            timestamp = event.get("timestamp")
+            if timestamp is None:
+                # Unreadable times sort as if the event happened when seen.
+                timestamp = _event_timestamp(event.get("time")) or parcel.fetched_at
+                event = {**event, "timestamp": timestamp}
+            if trimmed_before is not None and timestamp <= trimmed_before:
+                continue
+            keys.add(key)
+            bisect.insort(events, event, key=lambda item: item["timestamp"])
+            changed = True
+        if len(events) > MAX_EVENTS_PER_PARCEL:
+            trimmed = events[:-MAX_EVENTS_PER_PARCEL]
+            del events[:-MAX_EVENTS_PER_PARCEL]
+            # Stored, so the courier cannot re-add trimmed events even
+            # after a restart.
+            timeline["trimmed_before"] = trimmed[-1]["timestamp"]
+            for event in trimmed:
+                keys.discard(_event_key(event))
+        return changed
+
+    def _prune(self, now: float) -> bool:
+        """Forget parcels gone for too long, then the least recent over the cap."""
+        cutoff = now - TIMELINE_RETENTION.total_seconds()
+        expired = [
+            parcel_id
+            for parcel_id, timeline in self._timelines.items()
+            if timeline.get("last_seen", 0) < cutoff
+        ]
+        overflow = len(self._timelines) - len(expired) - MAX_PARCELS
+        if overflow > 0:
+            remaining = sorted(
+                (pid for pid in self._timelines if pid not in expired),
+                key=lambda pid: self._timelines[pid].get("last_seen", 0),
+            )
+            expired.extend(remaining[:overflow])
+        for parcel_id in expired:
+            del self._timelines[parcel_id]
+            del self._keys[parcel_id]
+        return bool(expired)
+
+    def _data(self) -> dict:
+        return {"parcels": self._timelines}
+
+    def __contains__(self, parcel_id: str) -> bool:
+        return parcel_id in self._timelines
+
+    def events(self, parcel_id: str) -> list[dict[str, Any]]:
+        """Return a parcel's events, newest first."""
+        timeline = self._timelines.get(parcel_id)
+        if timeline is None:
+            return []
+        return timeline["events"][::-1]
@@ -0,0 +1,270 @@
+"""Websocket commands for Polish Shipment Tracking."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+from homeassistant.helpers.entity_registry import async_get as async_get_entity_registry
+import voluptuous as vol
+
+from .const import (
+    DOMAIN,
+    INTEGRATION_VERSION,
+    CONF_PHONE,
+    CONF_EMAIL,
+    SIGNAL_PARCELS_UPDATED,
+)
+from .coordinator import AccountView, async_get_coordinators
+
+# Same ordering the card used: ready for pickup, then on the way, then rest.
+_STATUS_RANK = {
+    "waiting_for_pickup": 0,
+    "handed_out_for_delivery": 1,
+    "in_transport": 1,
+}
+
+_SORT_KEYS = {
+    "status": lambda s: (_STATUS_RANK.get(s["status_key"], 2), s["courier"], s["tracking_number"]),
+    "courier": lambda s: (s["courier"], s["tracking_number"]),
+    "tracking_number": lambda s: s["tracking_number"],
+}
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the integration's websocket commands."""
+    websocket_api.async_register_command(hass, websocket_get_version)
+    websocket_api.async_register_command(hass, websocket_get_raw_response)
+    websocket_api.async_register_command(hass, websocket_subscribe_shipments)
+    websocket_api.async_register_command(hass, websocket_get_timeline)
+
+
+# Websocket handler to expose the integration version to the frontend.
+@websocket_api.websocket_command({vol.Required("type"): f"{DOMAIN}/version"})
+@websocket_api.async_response
+async def websocket_get_version(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Handle version requests from the frontend."""
+    connection.send_result(msg["id"], {"version": INTEGRATION_VERSION})
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/raw_response",
+        vol.Required("entity_id"): cv.entity_id,
+    }
+)
+@callback
+def websocket_get_raw_response(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Return the raw courier payload behind a shipment sensor."""
+    parcel = _async_get_parcel_for_entity(hass, msg["entity_id"])
+    if parcel is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Shipment not found"
+        )
+        return
+    connection.send_result(
+        msg["id"],
+        {
+            "entity_id": msg["entity_id"],
+            "courier": parcel.courier,
+            "tracking_number": parcel.parcel_id,
+            "raw_response": parcel.raw,
+        },
+    )
+
+
+@callback
+def _async_get_parcel_for_entity(hass: HomeAssistant, entity_id: str) -> Any:
+    """Resolve a shipment sensor to the parcel record its coordinator holds."""
+    entity_entry = async_get_entity_registry(hass).async_get(entity_id)
+    if entity_entry is None or entity_entry.platform != DOMAIN:
+        return None
+    view = hass.data.get(DOMAIN, {}).get(entity_entry.config_entry_id)
+    if not isinstance(view, AccountView):
+        return None
+    # Unique IDs are "<courier>_<tracking number>".
+    prefix = f"{view.courier}_"
+    if not entity_entry.unique_id.startswith(prefix):
+        return None
+    return view.parcels_by_id.get(entity_entry.unique_id[len(prefix):])
+
+
+TIMELINE_PAGE_SIZE = 50
+TIMELINE_MAX_PAGE_SIZE = 200
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/timeline",
+        vol.Exclusive("entity_id", "shipment"): cv.entity_id,
+        vol.Exclusive("tracking_number", "shipment"): cv.string,
+        vol.Optional("courier"): cv.string,
+        vol.Optional("offset", default=0): vol.All(vol.Coerce(int), vol.Range(min=0)),
+        vol.Optional("limit", default=TIMELINE_PAGE_SIZE): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=TIMELINE_MAX_PAGE_SIZE)
+        ),
+    }
+)
+@callback
+def websocket_get_timeline(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Return one page of a shipment's tracking timeline, newest first.
+
+    The shipment is given by ``entity_id`` or by ``tracking_number`` (and
+    optionally ``courier``); the latter also works for delivered parcels
+    whose sensor is gone.
+    """
+    found = _async_find_timeline(hass, msg)
+    if found is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Shipment not found"
+        )
+        return
+    coordinator, tracking_number = found
+    events = coordinator.timeline.events(tracking_number)
+    offset, limit = msg["offset"], msg["limit"]
+    end = offset + limit
+    connection.send_result(
+        msg["id"],
+        {
+            "courier": coordinator.courier,
+            "tracking_number": tracking_number,
+            "events": events[offset:end],
+            "total": len(events),
+            "next_offset": end if end < len(events) else None,
+        },
+    )
+
+
+@callback
+def _async_find_timeline(hass: HomeAssistant, msg: dict) -> tuple[Any, str] | None:
+    """Resolve a timeline request to the coordinator and tracking number."""
+    if "entity_id" in msg:
+        entity_entry = async_get_entity_registry(hass).async_get(msg["entity_id"])
+        if entity_entry is None or entity_entry.platform != DOMAIN:
+            return None
+        view = hass.data.get(DOMAIN, {}).get(entity_entry.config_entry_id)
+        if not isinstance(view, AccountView):
+            return None
+        prefix = f"{view.courier}_"
+        if not entity_entry.unique_id.startswith(prefix):
+            return None
+        tracking_number = entity_entry.unique_id[len(prefix):]
+        if tracking_number not in view.coordinator.timeline:
+            return None
+        return view.coordinator, tracking_number
+
+    tracking_number = msg.get("tracking_number")
+    if tracking_number is None:
+        return None
+    for coordinator in async_get_coordinators(hass):
+        if "courier" in msg and coordinator.courier != msg["courier"]:
+            continue
+        if tracking_number in coordinator.timeline:
+            return coordinator, tracking_number
+    return None
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Optional("courier"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("account"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("status"): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("sort", default="status"): vol.In(list(_SORT_KEYS)),
+    }
+)
+@callback
+def websocket_subscribe_shipments(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict,
+) -> None:
+    """Stream active shipments: a full snapshot first, then only deltas.
+
+    Every event carries ``added`` and ``changed`` shipment objects and the
+    ``removed`` keys. ``order`` lists all keys in the requested sort order and
+    is only included when it changed.
+    """
+    sort_key = _SORT_KEYS[msg["sort"]]
+    sent: dict[str, dict[str, Any]] = {}
+    order: list[str] = []
+    initial = True
+
+    @callback
+    def _async_send_delta() -> None:
+        nonlocal order, initial
+        current = _async_build_shipments(hass, msg)
+        added = [s for key, s in current.items() if key not in sent]
+        changed = [s for key, s in current.items() if key in sent and sent[key] != s]
+        removed = [key for key in sent if key not in current]
+        new_order = [s["key"] for s in sorted(current.values(), key=sort_key)]
+        if not (initial or added or changed or removed or new_order != order):
+            return
+
+        payload: dict[str, Any] = {"added": added, "changed": changed, "removed": removed}
+        if initial or new_order != order:
+            payload["order"] = new_order
+        initial = False
+        order = new_order
+        sent.clear()
+        sent.update(current)
+        connection.send_message(websocket_api.event_message(msg["id"], payload))
+
+    connection.subscriptions[msg["id"]] = async_dispatcher_connect(
+        hass, SIGNAL_PARCELS_UPDATED, _async_send_delta
+    )
+    connection.send_result(msg["id"])
+    _async_send_delta()
+
+
+@callback
+def _async_build_shipments(hass: HomeAssistant, msg: dict) -> dict[str, dict[str, Any]]:
+    """Build the card's view of every active shipment matching the filters."""
+    couriers = set(msg["courier"]) if "courier" in msg else None
+    accounts = set(msg["account"]) if "account" in msg else None
+    statuses = set(msg["status"]) if "status" in msg else None
+    registry = async_get_entity_registry(hass)
+
+    shipments: dict[str, dict[str, Any]] = {}
+    for coordinator in async_get_coordinators(hass):
+        if couriers is not None and coordinator.courier not in couriers:
+            continue
+        entry_data = coordinator.entry.data
+        account = entry_data.get(CONF_PHONE) or entry_data.get(CONF_EMAIL)
+        if accounts is not None and account not in accounts:
+            continue
+        for parcel in coordinator.parcels_by_id.values():
+            if parcel.terminal:
+                continue
+            if statuses is not None and parcel.status_key not in statuses:
+                continue
+            key = f"{parcel.courier}_{parcel.parcel_id}"
+            shipments[key] = {
+                "key": key,
+                "entity_id": registry.async_get_entity_id("sensor", DOMAIN, key),
+                "courier": parcel.courier,
+                "account": account,
+                "tracking_number": parcel.parcel_id,
+                "status_key": parcel.status_key,
+                "status_raw": parcel.status_raw,
+                "sender": parcel.sender,
+                "recipient_name": parcel.attributes.get("recipient_name"),
+                "location": parcel.location,
+                "pickup_code": parcel.pickup_code,
+            }
+    return shipments